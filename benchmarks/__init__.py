@@ -0,0 +1 @@
+"""Benchmarks for the Sunology VAULT integration."""
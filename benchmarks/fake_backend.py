@@ -0,0 +1,289 @@
+"""Local stand-in for the Sunology cloud API.
+
+Run it on its own, e.g. to point a development Home Assistant at it:
+
+    python -m benchmarks.fake_backend --stations 100 --latency 0.2
+
+Besides the Sunology endpoints, it serves benchmark controls that are not
+counted in its statistics: GET /_bench/stats (POST to also reset them) and
+POST /_bench/expire to invalidate every session.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass, field
+import hashlib
+import random
+import secrets
+import time
+from typing import Any
+
+from aiohttp import web
+
+EMAIL = "bench@example.com"
+PASSWORD = "bench"
+
+
+@dataclass
+class BackendStats:
+    """Traffic seen by the fake backend."""
+
+    requests: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    errors: int = 0
+    by_endpoint: dict[str, int] = field(default_factory=dict)
+
+    def reset(self) -> None:
+        """Clear the counters."""
+        self.requests = self.bytes_in = self.bytes_out = self.errors = 0
+        self.by_endpoint.clear()
+
+
+class FakeSunologyBackend:
+    """aiohttp application mimicking the Sunology endpoints used by the client.
+
+    Serves station_count PLAY Max stations, each with a VAULT battery whose
+    level drifts between polls. Every request waits latency seconds (plus up
+    to jitter seconds), fails with a 503 with probability error_rate, and
+    sessions expire session_ttl seconds after login. With etags, station
+    details carry an ETag and are answered with a 304 when unchanged.
+    """
+
+    def __init__(
+        self,
+        station_count: int = 1,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        session_ttl: float | None = None,
+        seed: int = 0,
+        etags: bool = False,
+    ) -> None:
+        """Initialize the backend and its stations."""
+        self.etags = etags
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.session_ttl = session_ttl
+        self.stats = BackendStats()
+        self._random = random.Random(seed)
+        self._sessions: dict[str, float] = {}
+        self._stations: dict[str, dict[str, Any]] = {}
+        self._batteries: dict[str, dict[str, Any]] = {}
+        for index in range(station_count):
+            station_id = f"station-{index:04d}"
+            serial = f"PM{index:08d}"
+            self._stations[station_id] = {
+                "id": station_id,
+                "serialNumber": serial,
+                "name": f"PLAY Max {index}",
+                "batteryPreserveEnergy": False,
+                "batteryThreshold": "210",
+            }
+            self._batteries[serial] = {
+                "battery": self._random.randint(0, 100),
+                "batteryState": self._random.choice(
+                    ("OFF", "CHARGING", "DISCHARGING", "UNPLUGGED")
+                ),
+                "deviceState": "CONNECTED",
+                "power": self._random.randint(0, 450),
+            }
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    def expire_sessions(self) -> None:
+        """Invalidate every session, as the cloud does now and then."""
+        self._sessions.clear()
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/api/login-post", self._login)
+        app.router.add_get("/api/devices/stations-and-storages", self._stations_list)
+        app.router.add_post("/api/overview", self._overview)
+        app.router.add_get("/api/solar-panels/{station_id}", self._station_details)
+        app.router.add_patch("/api/solar-panels/{station_id}", self._station_update)
+        app.router.add_get("/_bench/stats", self._bench_stats)
+        app.router.add_post("/_bench/stats", self._bench_stats)
+        app.router.add_post("/_bench/expire", self._bench_expire)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.url = f"http://{host}:{self._runner.addresses[0][1]}"
+        return self.url
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        """Count traffic, then apply latency, errors and authentication."""
+        if request.path.startswith("/_bench/"):
+            return await handler(request)
+
+        body = await request.read()
+        self.stats.requests += 1
+        self.stats.bytes_in += len(body)
+        resource = request.match_info.route.resource
+        endpoint = resource.canonical if resource is not None else request.path
+        key = f"{request.method} {endpoint}"
+        self.stats.by_endpoint[key] = self.stats.by_endpoint.get(key, 0) + 1
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            response: web.StreamResponse = web.Response(
+                status=503, text="Service Unavailable"
+            )
+        elif request.path != "/api/login-post" and not self._authenticated(request):
+            response = web.Response(status=401)
+        else:
+            response = await handler(request)
+
+        if response.status >= 400:
+            self.stats.errors += 1
+        if isinstance(response, web.Response) and response.body is not None:
+            self.stats.bytes_out += len(response.body)
+        return response
+
+    def _authenticated(self, request: web.Request) -> bool:
+        """Return True if the request carries a live session."""
+        issued = self._sessions.get(request.cookies.get("SESSION", ""))
+        if issued is None:
+            return False
+        return self.session_ttl is None or time.monotonic() - issued < self.session_ttl
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Log in and set the SESSION cookie."""
+        body = await request.json()
+        if body.get("username") != EMAIL or body.get("password") != PASSWORD:
+            return web.Response(status=401)
+        token = secrets.token_hex(16)
+        self._sessions[token] = time.monotonic()
+        response = web.Response(status=204)
+        response.set_cookie("SESSION", token)
+        return response
+
+    async def _stations_list(self, request: web.Request) -> web.Response:
+        """Return the stations of the account."""
+        return web.json_response(
+            [
+                {
+                    "id": station["id"],
+                    "serialNumber": station["serialNumber"],
+                    "name": station["name"],
+                }
+                for station in self._stations.values()
+            ]
+        )
+
+    async def _overview(self, request: web.Request) -> web.Response:
+        """Return live data, drifting battery levels a little on each call."""
+        body = await request.json()
+        panels = {}
+        for serial, battery in self._batteries.items():
+            if battery["batteryState"] == "CHARGING":
+                battery["battery"] = min(100, battery["battery"] + 1)
+            elif battery["batteryState"] == "DISCHARGING":
+                battery["battery"] = max(0, battery["battery"] - 1)
+            panels[serial] = battery
+        return web.json_response(
+            {
+                "production": {"panels": panels},
+                "streamMeters": {
+                    meter_id: {"power": self._random.randint(-3000, 3000)}
+                    for meter_id in body.get("streamMeters", [])
+                },
+                "erls": {
+                    erl_id: {"power": self._random.randint(0, 2000)}
+                    for erl_id in body.get("erls", [])
+                },
+            }
+        )
+
+    async def _station_details(self, request: web.Request) -> web.Response:
+        """Return the details of a station."""
+        station = self._stations.get(request.match_info["station_id"])
+        if station is None:
+            return web.Response(status=404)
+        response = web.json_response(station)
+        if self.etags:
+            etag = f'"{hashlib.sha1(response.body).hexdigest()}"'
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
+        return response
+
+    async def _station_update(self, request: web.Request) -> web.Response:
+        """Update the settings of a station."""
+        station = self._stations.get(request.match_info["station_id"])
+        if station is None:
+            return web.Response(status=404)
+        changes = await request.json()
+        for key in ("batteryPreserveEnergy", "batteryThreshold"):
+            if key in changes:
+                station[key] = changes[key]
+        return web.json_response(station)
+
+    async def _bench_stats(self, request: web.Request) -> web.Response:
+        """Return the traffic statistics, resetting them on POST."""
+        response = web.json_response(asdict(self.stats))
+        if request.method == "POST":
+            self.stats.reset()
+        return response
+
+    async def _bench_expire(self, request: web.Request) -> web.Response:
+        """Invalidate every session."""
+        self.expire_sessions()
+        return web.Response(status=204)
+
+
+async def _async_serve(args: argparse.Namespace) -> None:
+    """Serve until cancelled, printing the base URL once ready."""
+    backend = FakeSunologyBackend(
+        station_count=args.stations,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        session_ttl=args.session_ttl,
+        seed=args.seed,
+        etags=args.etags,
+    )
+    url = await backend.async_start(args.host, args.port)
+    print(url, flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await backend.async_stop()
+
+
+def main() -> None:
+    """Run the fake backend from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stations", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0 to 1")
+    parser.add_argument("--session-ttl", type=float, default=None, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--etags", action="store_true", help="ETags on details")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    try:
+        asyncio.run(_async_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""Benchmark the Sunology VAULT coordinator polls against the fake backend.
+
+Run from the repository root, in an environment with Home Assistant installed:
+
+    python -m benchmarks.run --stations 1 10 100 500 --latency 0.05
+
+For each station count, a fake backend is started in a subprocess (so that
+its own CPU time and memory are not measured), and the coordinator of the
+integration, in adaptive mode, is driven on a throwaway Home Assistant
+instance. Two polls are timed, each being an update of the coordinator
+followed by the publishing of the changed batteries:
+
+- fast: a poll on a scan interval, the station list and details not being
+  due: the overview request, skipped if unchanged, its parsing, history,
+  power and energy estimation and the adaptive interval;
+- full: a poll on a settings interval: the station list and the details of
+  every station, fetched with bounded concurrency and skipped if unchanged,
+  then the fast poll steps.
+
+Each poll reports its median wall time and CPU time over the iterations,
+the number of requests and bytes seen by the backend, and the peak memory
+allocated meanwhile (tracemalloc).
+
+The parsing of the overview into the data model is also timed on its own,
+without network, along with the memory used per battery. Scaling target:
+applying the overview of 500 batteries in under 1 ms, with under 300 bytes
+per battery.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.sunology_vault.api import SunologyApiClient
+from custom_components.sunology_vault.const import (
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    MAX_DETAILS_INTERVAL,
+)
+from custom_components.sunology_vault.coordinator import (
+    SunologyDataUpdateCoordinator,
+)
+from custom_components.sunology_vault.models import (
+    BatteryData,
+    apply_panel,
+    overview_panels,
+    parse_stations,
+)
+from custom_components.sunology_vault.session import async_get_session
+
+from .fake_backend import EMAIL, PASSWORD
+
+STATION_COUNTS = (1, 10, 50, 100, 500)
+BACKEND_START_TIMEOUT = 30
+PARSE_ROUNDS = 200
+
+
+@dataclass(slots=True)
+class PollResult:
+    """Measurements of one kind of poll."""
+
+    stations: int
+    poll: str
+    wall_ms: float
+    cpu_ms: float
+    requests: float
+    bytes_in: float
+    bytes_out: float
+    errors: float
+    peak_kib: float
+
+
+@dataclass(slots=True)
+class ParseResult:
+    """Measurements of overview parsing."""
+
+    stations: int
+    parse_us: float
+    bytes_per_battery: float
+
+
+class BenchConfigEntry:
+    """The parts of a config entry used by the coordinator."""
+
+    entry_id = "benchmark"
+    # Polls are run by the benchmark, never scheduled
+    pref_disable_polling = True
+
+    def async_on_unload(self, func: Callable[[], Any]) -> None:
+        """Ignore the callback, the coordinator is shut down by the benchmark."""
+
+
+class BenchPoller:
+    """Run the polls of a coordinator the way its scheduled refreshes do."""
+
+    def __init__(self, coordinator: SunologyDataUpdateCoordinator) -> None:
+        """Initialize the poller."""
+        self.coordinator = coordinator
+
+    async def _async_poll(self) -> None:
+        """Update the coordinator and publish the changes to its listeners."""
+        coordinator = self.coordinator
+        try:
+            data = await coordinator._async_update_data()  # noqa: SLF001
+        except UpdateFailed as err:
+            coordinator.async_set_update_error(err)
+        else:
+            coordinator.async_set_updated_data(data)
+
+    async def full_poll(self) -> None:
+        """Poll with the station list and details due."""
+        self.coordinator.set_details_interval(0)
+        await self._async_poll()
+
+    async def fast_poll(self) -> None:
+        """Poll with the station list and details not due."""
+        self.coordinator.set_details_interval(MAX_DETAILS_INTERVAL)
+        await self._async_poll()
+
+
+async def _async_start_backend(
+    args: argparse.Namespace, stations: int
+) -> tuple[asyncio.subprocess.Process, str]:
+    """Start a fake backend subprocess and return it with its base URL."""
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.fake_backend",
+        "--stations",
+        str(stations),
+        "--latency",
+        str(args.latency),
+        "--jitter",
+        str(args.jitter),
+        "--error-rate",
+        str(args.error_rate),
+    ]
+    if args.session_ttl is not None:
+        command += ["--session-ttl", str(args.session_ttl)]
+    if args.etags:
+        command.append("--etags")
+    process = await asyncio.create_subprocess_exec(
+        *command, stdout=asyncio.subprocess.PIPE
+    )
+    assert process.stdout is not None
+    line = await asyncio.wait_for(process.stdout.readline(), BACKEND_START_TIMEOUT)
+    if not line:
+        raise RuntimeError("Fake backend failed to start")
+    return process, line.decode().strip()
+
+
+async def _async_backend_stats(
+    session: aiohttp.ClientSession, url: str, reset: bool = False
+) -> dict[str, Any]:
+    """Return the backend statistics, optionally resetting them."""
+    async with session.request(
+        "POST" if reset else "GET", f"{url}/_bench/stats"
+    ) as resp:
+        return await resp.json()
+
+
+async def _async_measure(
+    stations: int,
+    name: str,
+    poll: Callable[[], Awaitable[None]],
+    iterations: int,
+    session: aiohttp.ClientSession,
+    url: str,
+) -> PollResult:
+    """Time a poll over several iterations."""
+    wall: list[float] = []
+    cpu: list[float] = []
+    peaks: list[float] = []
+    totals = {"requests": 0, "bytes_in": 0, "bytes_out": 0, "errors": 0}
+    for _ in range(iterations):
+        await _async_backend_stats(session, url, reset=True)
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        await poll()
+        wall.append(time.perf_counter() - wall_start)
+        cpu.append(time.process_time() - cpu_start)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        stats = await _async_backend_stats(session, url)
+        for key in totals:
+            totals[key] += stats[key]
+
+    return PollResult(
+        stations=stations,
+        poll=name,
+        wall_ms=statistics.median(wall) * 1000,
+        cpu_ms=statistics.median(cpu) * 1000,
+        requests=totals["requests"] / iterations,
+        bytes_in=totals["bytes_in"] / iterations,
+        bytes_out=totals["bytes_out"] / iterations,
+        errors=totals["errors"] / iterations,
+        peak_kib=max(peaks) / 1024,
+    )
+
+
+async def _async_bench_stations(
+    args: argparse.Namespace, stations: int
+) -> list[PollResult]:
+    """Benchmark both polls for a station count."""
+    process, url = await _async_start_backend(args, stations)
+    config_dir = tempfile.TemporaryDirectory()
+    hass = HomeAssistant(config_dir.name)
+    client = SunologyApiClient(
+        EMAIL, PASSWORD, session=async_get_session(hass), base_url=url
+    )
+    coordinator = SunologyDataUpdateCoordinator(
+        hass,
+        BenchConfigEntry(),  # type: ignore[arg-type]
+        client,
+        DEFAULT_SCAN_INTERVAL,
+        max_concurrent_requests=args.concurrency,
+    )
+    coordinator.set_adaptive_polling(
+        True, DEFAULT_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL
+    )
+    try:
+        async with aiohttp.ClientSession() as control:
+            await client.async_login()
+            poller = BenchPoller(coordinator)
+            # Warm up the connection pool and the station list
+            await poller.full_poll()
+            return [
+                await _async_measure(
+                    stations, "full", poller.full_poll, args.iterations, control, url
+                ),
+                await _async_measure(
+                    stations, "fast", poller.fast_poll, args.iterations, control, url
+                ),
+            ]
+    finally:
+        await coordinator.async_shutdown()
+        # Closes the shared session
+        await hass.async_stop(force=True)
+        config_dir.cleanup()
+        process.terminate()
+        await process.wait()
+
+
+def _bench_parse(stations: int) -> ParseResult:
+    """Time applying an overview to the data model, and measure its size."""
+    serials = [f"PM{index:08d}" for index in range(stations)]
+    station_list = [
+        {"id": f"station-{index:04d}", "serialNumber": serial, "name": serial}
+        for index, serial in enumerate(serials)
+    ]
+    overview = {
+        "production": {
+            "panels": {
+                serial: {
+                    "battery": 50,
+                    "batteryState": "CHARGING",
+                    "deviceState": "CONNECTED",
+                }
+                for serial in serials
+            }
+        }
+    }
+
+    tracemalloc.start()
+    batteries: dict[str, BatteryData] = {}
+    baseline, _ = tracemalloc.get_traced_memory()
+    parse_stations(station_list, batteries)
+    size = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    durations: list[float] = []
+    for _ in range(PARSE_ROUNDS):
+        start = time.perf_counter()
+        panels = overview_panels(overview)
+        for serial, battery in batteries.items():
+            apply_panel(battery, panels.get(serial))
+        durations.append(time.perf_counter() - start)
+
+    return ParseResult(
+        stations=stations,
+        parse_us=statistics.median(durations) * 1e6,
+        bytes_per_battery=size / stations,
+    )
+
+
+def _print_parse_results(results: list[ParseResult]) -> None:
+    """Print the parsing results as a table."""
+    header = f"{'stations':>8} {'parse us':>9} {'bytes/battery':>13}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result.stations:>8} {result.parse_us:>9.1f} "
+            f"{result.bytes_per_battery:>13.0f}"
+        )
+
+
+def _print_results(results: list[PollResult]) -> None:
+    """Print the results as a table."""
+    header = (
+        f"{'stations':>8} {'poll':>4} {'wall ms':>9} {'cpu ms':>8} "
+        f"{'requests':>8} {'bytes in':>9} {'bytes out':>10} {'errors':>6} "
+        f"{'peak KiB':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result.stations:>8} {result.poll:>4} {result.wall_ms:>9.1f} "
+            f"{result.cpu_ms:>8.1f} {result.requests:>8.1f} "
+            f"{result.bytes_in:>9.0f} {result.bytes_out:>10.0f} "
+            f"{result.errors:>6.1f} {result.peak_kib:>9.1f}"
+        )
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run the benchmarks."""
+    _print_parse_results([_bench_parse(stations) for stations in args.stations])
+    print()
+
+    tracemalloc.start()
+    results: list[PollResult] = []
+    for stations in args.stations:
+        results.extend(await _async_bench_stations(args, stations))
+    tracemalloc.stop()
+    _print_results(results)
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stations", type=int, nargs="+", default=STATION_COUNTS)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0 to 1")
+    parser.add_argument("--session-ttl", type=float, default=None, help="seconds")
+    parser.add_argument("--etags", action="store_true", help="ETags on details")
+    asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,60 +4,196 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
 from .api import ApiError, AuthenticationError, SunologyApiClient
-from .const import CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_DETAILS_INTERVAL,
+    CONF_ERLS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_POLLING_MODE,
+    CONF_SCAN_INTERVAL,
+    CONF_STREAM_METERS,
+    DATA_SCHEDULER,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_DETAILS_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_POLLING_MODE,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    POLLING_MODE_ADAPTIVE,
+    STORAGE_KEY_ENERGY,
+    STORAGE_KEY_HISTORY,
+    STORAGE_KEY_SESSION,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_VERSION,
+)
 from .coordinator import SunologyDataUpdateCoordinator
+from .scheduler import RequestScheduler
+from .services import async_setup_services
+from .session import async_get_session
 
 PLATFORMS = [Platform.NUMBER, Platform.SENSOR, Platform.SWITCH]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Sunology VAULT services and the shared request scheduler."""
+    hass.data[DATA_SCHEDULER] = RequestScheduler()
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Sunology VAULT from config entry."""
+    session_store: Store[dict[str, str]] = Store(
+        hass,
+        STORAGE_VERSION,
+        STORAGE_KEY_SESSION.format(entry.entry_id),
+        private=True,
+    )
+    stored_session = await session_store.async_load() or {}
+
+    @callback
+    def _async_save_session_token(token: str) -> None:
+        session_store.async_delay_save(lambda: {"session_token": token})
+
+    scheduler: RequestScheduler = hass.data[DATA_SCHEDULER]
     client = SunologyApiClient(
         entry.data[CONF_EMAIL],
         entry.data[CONF_PASSWORD],
+        session=async_get_session(hass),
+        session_token=stored_session.get("session_token"),
+        on_token_refreshed=_async_save_session_token,
+        scheduler=scheduler,
     )
 
-    try:
-        await client.async_login()
-    except AuthenticationError as err:
-        await client.async_close()
-        raise ConfigEntryAuthFailed(err) from err
-    except ApiError as err:
-        await client.async_close()
-        raise ConfigEntryNotReady(err) from err
-
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    coordinator = SunologyDataUpdateCoordinator(hass, client, scan_interval)
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception:
-        await client.async_close()
-        raise
+    coordinator = SunologyDataUpdateCoordinator(
+        hass, entry, client, scan_interval, scheduler=scheduler
+    )
+    _apply_options(coordinator, entry)
+    # With the last known data, entities are set up right away and the
+    # first live refresh runs in the background, the client logging in on
+    # its first request.
+    restored = await coordinator.async_restore()
+    if not restored:
+        await _async_first_refresh(coordinator)
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    scheduler.register(entry.entry_id)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+
     return True
 
 
+async def _async_first_refresh(coordinator: SunologyDataUpdateCoordinator) -> None:
+    """Log in if needed and fetch the first data, before entities are set up.
+
+    A persisted session token is reused as is: if it expired, the client
+    logs in again on the first 401.
+    """
+    client = coordinator.client
+    try:
+        if client.session_token is None:
+            try:
+                await client.async_login()
+            except AuthenticationError as err:
+                raise ConfigEntryAuthFailed(err) from err
+            except ApiError as err:
+                raise ConfigEntryNotReady(err) from err
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await client.async_close()
+        raise
+
+
+def _apply_options(coordinator: SunologyDataUpdateCoordinator, entry: ConfigEntry) -> None:
+    """Apply config entry options to the coordinator."""
+    options = entry.options
+    coordinator.set_scan_interval(
+        options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    )
+    coordinator.set_details_interval(
+        options.get(CONF_DETAILS_INTERVAL, DEFAULT_DETAILS_INTERVAL)
+    )
+    coordinator.set_max_concurrent_requests(
+        options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
+    )
+    coordinator.set_adaptive_polling(
+        options.get(CONF_POLLING_MODE, DEFAULT_POLLING_MODE) == POLLING_MODE_ADAPTIVE,
+        options.get(CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL),
+        options.get(CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL),
+    )
+    coordinator.set_overview_meters(
+        options.get(CONF_STREAM_METERS, []), options.get(CONF_ERLS, [])
+    )
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     coordinator: SunologyDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    coordinator.set_scan_interval(scan_interval)
+    if list(coordinator.data.stream_meters) != entry.options.get(
+        CONF_STREAM_METERS, []
+    ) or list(coordinator.data.erls) != entry.options.get(CONF_ERLS, []):
+        # Meter entities are created at setup
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    _apply_options(coordinator, entry)
+
+
+async def async_remove_config_entry_device(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> bool:
+    """Allow removing a device that is no longer reported by the account."""
+    coordinator: SunologyDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data
+    known = {
+        entry.entry_id,
+        *data.batteries,
+        *(f"{meter.kind}_{meter.id}" for meter in data.stream_meters.values()),
+        *(f"{erl.kind}_{erl.id}" for erl in data.erls.values()),
+    }
+    return not any(
+        domain == DOMAIN and identifier in known
+        for domain, identifier in device.identifiers
+    )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         coordinator: SunologyDataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DATA_SCHEDULER].unregister(entry.entry_id)
+        await coordinator.async_shutdown()
         await coordinator.client.async_close()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a config entry."""
+    for key in (
+        STORAGE_KEY_SESSION,
+        STORAGE_KEY_HISTORY,
+        STORAGE_KEY_ENERGY,
+        STORAGE_KEY_SNAPSHOT,
+    ):
+        await Store(hass, STORAGE_VERSION, key.format(entry.entry_id)).async_remove()
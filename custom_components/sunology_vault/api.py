@@ -1,19 +1,32 @@
 """Sunology API client."""
 
 import asyncio
+import hashlib
 import json
 import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 import aiohttp
 
-from .const import API_HEADERS, BASE_URL
+from .const import BASE_URL
+from .metrics import ClientMetrics
+from .resilience import (
+    RETRYABLE_STATUSES,
+    BackoffPolicy,
+    CircuitBreaker,
+    circuit_key,
+    endpoint_key,
+    parse_retry_after,
+)
+from .scheduler import PRIORITY_POLL, PRIORITY_WRITE, RequestScheduler
+from .trace import RequestTracer, TraceRecord
+from .transport import JSON_DECODER, REQUEST_HEADERS, create_session
 
 _LOGGER = logging.getLogger(__name__)
 
-RETRY_ATTEMPTS = 2
-RETRY_DELAY = 1
-
 
 def _mask_sensitive_data(data: dict | None, keys_to_mask: set[str]) -> dict | None:
     """Mask sensitive data in a dictionary for logging."""
@@ -34,6 +47,20 @@ def _format_json(data: Any) -> str:
         return str(data)
 
 
+class _LazyJson:
+    """Defer JSON formatting until a log record is actually emitted."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Any) -> None:
+        """Wrap data to format."""
+        self._data = data
+
+    def __str__(self) -> str:
+        """Format the wrapped data."""
+        return _format_json(self._data)
+
+
 class AuthenticationError(Exception):
     """Authentication error."""
 
@@ -42,49 +69,129 @@ class ApiError(Exception):
     """API error."""
 
 
+class CircuitOpenError(ApiError):
+    """Requests to an endpoint are suspended after repeated failures."""
+
+
+class _TransientApiError(ApiError):
+    """Server error or throttling worth retrying."""
+
+    def __init__(self, status: int, retry_after: float | None) -> None:
+        """Initialize the error with the server's Retry-After hint."""
+        super().__init__(f"API error: {status}")
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    """Last response of a cacheable request, to detect unchanged ones."""
+
+    request: Any
+    digest: bytes
+    data: Any
+    etag: str | None
+    last_modified: str | None
+
+
 class SunologyApiClient:
-    """Async client for Sunology API."""
+    """Async client for Sunology API.
+
+    Responses of the overview and station details are remembered: their
+    validators are sent back as If-None-Match/If-Modified-Since when the
+    backend provided some, and a response whose body hashes the same as the
+    previous one is not decoded again. Callers passing only_if_changed get
+    None for an unchanged response.
+    """
 
-    def __init__(self, email: str, password: str) -> None:
-        """Initialize the client."""
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        session: aiohttp.ClientSession | None = None,
+        session_token: str | None = None,
+        on_token_refreshed: Callable[[str], None] | None = None,
+        scheduler: RequestScheduler | None = None,
+        backoff: BackoffPolicy | None = None,
+        base_url: str = BASE_URL,
+        json_decoder: Callable[[bytes], Any] = JSON_DECODER,
+    ) -> None:
+        """Initialize the client.
+
+        A shared session is used as is and never closed by the client,
+        otherwise the client creates and owns its own pooled session.
+        A previously persisted session token can be reused, and
+        on_token_refreshed is called whenever a new one is obtained.
+        Requests are paced by the scheduler, if any, and retried following
+        the backoff policy. Each endpoint, and each station, has its own
+        circuit breaker.
+        base_url can point the client at another backend, e.g. for benchmarks.
+        Response bodies are decoded with json_decoder.
+        """
+        self._base_url = base_url
+        self._json_decoder = json_decoder
         self._email = email
         self._password = password
-        self._session_token: str | None = None
-        self._session: aiohttp.ClientSession | None = None
+        self._session_token = session_token
+        self._on_token_refreshed = on_token_refreshed
+        self._auth_lock = asyncio.Lock()
+        self._scheduler = scheduler
+        self._session = session
+        self._owns_session = session is None
+        self._backoff = backoff or BackoffPolicy()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._responses: dict[str, _CachedResponse] = {}
+        self.tracer = RequestTracer()
+        self.metrics = ClientMetrics()
+
+    @property
+    def session_token(self) -> str | None:
+        """Return the current session token."""
+        return self._session_token
+
+    @property
+    def open_circuits(self) -> list[str]:
+        """Return the endpoints whose requests are currently suspended."""
+        return [key for key, breaker in self._breakers.items() if breaker.is_open]
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create the aiohttp session."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
+        if self._session is None or (self._owns_session and self._session.closed):
+            self._session = create_session()
         return self._session
 
     async def async_close(self) -> None:
-        """Close the aiohttp session."""
+        """Close the aiohttp session if owned by the client."""
+        if not self._owns_session:
+            return
         if self._session and not self._session.closed:
             await self._session.close()
             self._session = None
 
     async def async_login(self) -> bool:
         """Authenticate and store session token."""
-        url = f"{BASE_URL}/api/login-post"
+        url = f"{self._base_url}/api/login-post"
         body = {"username": self._email, "password": self._password}
         masked_body = _mask_sensitive_data(body, {"password"})
 
         _LOGGER.debug(
             "[API] >>> POST %s\n[API] Request body:\n%s",
             url,
-            _format_json(masked_body),
+            _LazyJson(masked_body),
         )
 
+        if self._scheduler is not None:
+            await self._scheduler.acquire(PRIORITY_WRITE)
+        start = time.monotonic()
+        status: int | None = None
+        error: str | None = None
         try:
             session = await self._get_session()
             async with session.post(
                 url,
                 json=body,
-                headers=API_HEADERS,
+                headers=REQUEST_HEADERS,
             ) as resp:
+                status = resp.status
                 _LOGGER.debug(
                     "[API] <<< Response: %s %s",
                     resp.status,
@@ -100,8 +207,9 @@ class SunologyApiClient:
                     cookie = resp.cookies.get("SESSION")
                     if cookie:
                         self._session_token = cookie.value
-                        self._password = ""
                         _LOGGER.debug("[API] Login successful, session token stored")
+                        if self._on_token_refreshed is not None:
+                            self._on_token_refreshed(cookie.value)
                         return True
                     raise AuthenticationError("No session cookie in response")
                 if resp.status == 401:
@@ -110,24 +218,75 @@ class SunologyApiClient:
         except AuthenticationError:
             raise
         except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            error = repr(err)
             _LOGGER.debug("[API] Network error: %s", err)
             raise ApiError(f"Network error: {err}") from err
+        finally:
+            latency_ms = (time.monotonic() - start) * 1000
+            self.metrics.record_request(
+                "POST /api/login-post",
+                latency_ms,
+                None,
+                error=status is None or status >= 400,
+            )
+            self.tracer.record(
+                TraceRecord(
+                    timestamp=time.time(),
+                    method="POST",
+                    endpoint="/api/login-post",
+                    status=status,
+                    latency_ms=latency_ms,
+                    size=None,
+                    request_body=masked_body,
+                    error=error,
+                )
+            )
 
     async def async_get_stations(self) -> list[dict[str, Any]]:
         """Get list of stations."""
         return await self._async_request("GET", "/api/devices/stations-and-storages")
 
-    async def async_get_overview(self) -> dict[str, Any]:
-        """Get real-time overview data."""
+    async def async_get_overview(
+        self,
+        stream_meters: list[str] | None = None,
+        erls: list[str] | None = None,
+        only_if_changed: bool = False,
+    ) -> dict[str, Any] | None:
+        """Get real-time overview data, including the given meters and ERLs.
+
+        With only_if_changed, None is returned if the overview is the same
+        as the last one.
+        """
         return await self._async_request(
             "POST",
             "/api/overview",
-            json_data={"storages": [], "streamMeters": [], "erls": []},
+            json_data={
+                "storages": [],
+                "streamMeters": stream_meters or [],
+                "erls": erls or [],
+            },
+            cache=True,
+            only_if_changed=only_if_changed,
         )
 
-    async def async_get_station_details(self, station_id: str) -> dict[str, Any]:
-        """Get detailed info for a station."""
-        return await self._async_request("GET", f"/api/solar-panels/{station_id}")
+    async def async_get_station_details(
+        self,
+        station_id: str,
+        priority: int = PRIORITY_POLL,
+        only_if_changed: bool = False,
+    ) -> dict[str, Any] | None:
+        """Get detailed info for a station.
+
+        With only_if_changed, None is returned if the details are the same
+        as the last ones.
+        """
+        return await self._async_request(
+            "GET",
+            f"/api/solar-panels/{station_id}",
+            priority=priority,
+            cache=True,
+            only_if_changed=only_if_changed,
+        )
 
     async def async_update_station(
         self,
@@ -148,72 +307,260 @@ class SunologyApiClient:
         if threshold is not None:
             data["batteryThreshold"] = str(threshold)
 
+        # The details are about to change, don't trust their validators
+        self._responses.pop(f"GET /api/solar-panels/{station_id}", None)
         return await self._async_request(
             "PATCH",
             f"/api/solar-panels/{station_id}",
             json_data=data,
+            priority=PRIORITY_WRITE,
         )
 
+    async def _async_reauthenticate(self, expired_token: str | None) -> None:
+        """Log in again, once for all requests that used the expired token."""
+        async with self._auth_lock:
+            if self._session_token != expired_token:
+                # Another request already logged in again while we waited
+                return
+            _LOGGER.debug("[API] Session expired, logging in again")
+            await self.async_login()
+
     async def _async_request(
         self,
         method: str,
         endpoint: str,
         json_data: dict[str, Any] | None = None,
-    ) -> dict[str, Any] | list[dict[str, Any]]:
-        """Make authenticated API request with retry for transient errors."""
+        priority: int = PRIORITY_POLL,
+        cache: bool = False,
+        only_if_changed: bool = False,
+    ) -> Any:
+        """Make authenticated API request, logging in again if the session expired.
+
+        Responses to cache requests are remembered, see the class docstring.
+        """
+        token = self._session_token
+        args = (method, endpoint, json_data, priority, cache, only_if_changed)
+        try:
+            return await self._async_send(*args)
+        except AuthenticationError:
+            if not self._password:
+                raise
+        await self._async_reauthenticate(token)
+        return await self._async_send(*args)
+
+    async def _async_send(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: dict[str, Any] | None = None,
+        priority: int = PRIORITY_POLL,
+        cache: bool = False,
+        only_if_changed: bool = False,
+    ) -> Any:
+        """Send an authenticated API request with retry for transient errors.
+
+        Network errors, server errors and throttling are retried with
+        exponential backoff, honoring Retry-After. Once retries are exhausted
+        the failure counts against the endpoint's circuit breaker.
+        """
         if not self._session_token:
             raise AuthenticationError("Not authenticated")
 
-        url = f"{BASE_URL}{endpoint}"
-        headers = {**API_HEADERS, "Cookie": f"SESSION={self._session_token}"}
+        key = endpoint_key(method, endpoint)
+        circuit = circuit_key(method, endpoint)
+        breaker = self._breakers.setdefault(circuit, CircuitBreaker())
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {circuit}")
+        # A half-open probe is a single request
+        probe = breaker.probing
+        attempts = 1 if probe else self._backoff.attempts
+
+        url = f"{self._base_url}{endpoint}"
+        headers = {**REQUEST_HEADERS, "Cookie": f"SESSION={self._session_token}"}
 
         last_err: Exception | None = None
-        for attempt in range(1, RETRY_ATTEMPTS + 1):
-            # Log request details
-            _LOGGER.debug("[API] >>> %s %s (attempt %s)", method, url, attempt)
-            if json_data:
-                _LOGGER.debug("[API] Request body:\n%s", _format_json(json_data))
-
-            try:
-                session = await self._get_session()
-                async with session.request(
-                    method,
-                    url,
-                    headers=headers,
-                    json=json_data,
-                ) as resp:
-                    # Log response status
+        try:
+            for attempt in range(1, attempts + 1):
+                retry_after: float | None = None
+                try:
+                    data = await self._async_send_once(
+                        method,
+                        endpoint,
+                        key,
+                        url,
+                        headers,
+                        json_data,
+                        priority,
+                        attempt,
+                        cache,
+                        only_if_changed,
+                    )
+                except _TransientApiError as err:
+                    last_err = err
+                    retry_after = err.retry_after
+                except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                    last_err = err
+                else:
+                    breaker.record_success()
+                    return data
+                _LOGGER.debug(
+                    "[API] Transient error (attempt %s/%s): %s",
+                    attempt,
+                    attempts,
+                    last_err,
+                )
+                if attempt == attempts:
+                    break
+                if (delay := self._backoff.delay(attempt, retry_after)) is None:
                     _LOGGER.debug(
-                        "[API] <<< Response: %s %s",
-                        resp.status,
-                        resp.reason,
+                        "[API] Retry-After of %.0fs too long, giving up", retry_after
                     )
+                    break
+                self.metrics.record_retry(key)
+                await asyncio.sleep(delay)
+        except (AuthenticationError, ApiError):
+            # The backend answered: it is up, whatever the outcome
+            breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            if probe:
+                breaker.abort_probe()
+            raise
 
-                    if resp.status == 401:
-                        _LOGGER.debug("[API] Session expired (401)")
-                        raise AuthenticationError("Session expired")
-                    if resp.status >= 400:
-                        body_text = await resp.text()
-                        _LOGGER.debug("[API] Error response body:\n%s", body_text)
-                        raise ApiError(f"API error: {resp.status}")
+        breaker.record_failure()
+        if breaker.is_open and not probe:
+            _LOGGER.warning(
+                "Suspending requests to %s after repeated failures", circuit
+            )
+        if isinstance(last_err, ApiError):
+            raise ApiError(str(last_err)) from last_err
+        raise ApiError(f"Network error: {last_err}") from last_err
 
-                    response_data = await resp.json()
-                    _LOGGER.debug(
-                        "[API] Response body:\n%s",
-                        _format_json(response_data),
+    async def _async_send_once(
+        self,
+        method: str,
+        endpoint: str,
+        key: str,
+        url: str,
+        headers: dict[str, str],
+        json_data: dict[str, Any] | None,
+        priority: int,
+        attempt: int,
+        cache: bool,
+        only_if_changed: bool,
+    ) -> Any:
+        """Send a single request attempt and record its trace and metrics."""
+        # Log request details
+        _LOGGER.debug("[API] >>> %s %s (attempt %s)", method, url, attempt)
+        if json_data:
+            _LOGGER.debug("[API] Request body:\n%s", _LazyJson(json_data))
+
+        cached: _CachedResponse | None = None
+        if cache:
+            cache_key = f"{method} {endpoint}"
+            cached = self._responses.get(cache_key)
+            if cached is not None and cached.request != json_data:
+                cached = None
+            if cached is not None and (cached.etag or cached.last_modified):
+                headers = dict(headers)
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+
+        if self._scheduler is not None:
+            await self._scheduler.acquire(priority)
+        start = time.monotonic()
+        status: int | None = None
+        size: int | None = None
+        response_data: Any = None
+        error: str | None = None
+        try:
+            session = await self._get_session()
+            async with session.request(
+                method,
+                url,
+                headers=headers,
+                json=json_data,
+            ) as resp:
+                status = resp.status
+                # Log response status
+                _LOGGER.debug(
+                    "[API] <<< Response: %s %s",
+                    resp.status,
+                    resp.reason,
+                )
+
+                if resp.status == 401:
+                    _LOGGER.debug("[API] Session expired (401)")
+                    raise AuthenticationError("Session expired")
+                if resp.status >= 400:
+                    response_data = await resp.text()
+                    size = len(response_data)
+                    _LOGGER.debug("[API] Error response body:\n%s", response_data)
+                    if resp.status in RETRYABLE_STATUSES:
+                        raise _TransientApiError(
+                            resp.status,
+                            parse_retry_after(resp.headers.get("Retry-After")),
+                        )
+                    raise ApiError(f"API error: {resp.status}")
+
+                if resp.status == 304 and cached is not None:
+                    size = 0
+                    return self._unchanged(key, cached, only_if_changed)
+
+                body = await resp.read()
+                size = len(body)
+                if cache:
+                    digest = hashlib.blake2b(body, digest_size=16).digest()
+                    if cached is not None and cached.digest == digest:
+                        return self._unchanged(key, cached, only_if_changed)
+                try:
+                    response_data = self._json_decoder(body) if body.strip() else None
+                except ValueError as err:
+                    raise ApiError(f"Invalid JSON response: {err}") from err
+                if cache:
+                    self._responses[cache_key] = _CachedResponse(
+                        request=json_data,
+                        digest=digest,
+                        data=response_data,
+                        etag=resp.headers.get("ETag"),
+                        last_modified=resp.headers.get("Last-Modified"),
                     )
-                    return response_data
-            except (AuthenticationError, ApiError):
-                raise
-            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-                last_err = err
                 _LOGGER.debug(
-                    "[API] Transient error (attempt %s/%s): %s",
-                    attempt,
-                    RETRY_ATTEMPTS,
-                    err,
+                    "[API] Response body:\n%s",
+                    _LazyJson(response_data),
                 )
-                if attempt < RETRY_ATTEMPTS:
-                    await asyncio.sleep(RETRY_DELAY)
+                return response_data
+        except (
+            AuthenticationError,
+            ApiError,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as err:
+            error = repr(err)
+            raise
+        finally:
+            latency_ms = (time.monotonic() - start) * 1000
+            self.metrics.record_request(key, latency_ms, size, error is not None)
+            self.tracer.record(
+                TraceRecord(
+                    timestamp=time.time(),
+                    method=method,
+                    endpoint=endpoint,
+                    status=status,
+                    latency_ms=latency_ms,
+                    size=size,
+                    request_body=json_data,
+                    response_body=response_data,
+                    error=error,
+                )
+            )
 
-        raise ApiError(f"Network error: {last_err}") from last_err
+    def _unchanged(
+        self, key: str, cached: _CachedResponse, only_if_changed: bool
+    ) -> Any:
+        """Count an unchanged response and return what the caller expects."""
+        _LOGGER.debug("[API] Response unchanged")
+        self.metrics.record_unchanged(key)
+        return None if only_if_changed else cached.data
@@ -12,15 +12,41 @@ import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import callback
+from homeassistant.helpers.selector import (
+    SelectSelector,
+    SelectSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
 
 from .api import ApiError, AuthenticationError, SunologyApiClient
 from .const import (
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_DETAILS_INTERVAL,
+    CONF_ERLS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_POLLING_MODE,
     CONF_SCAN_INTERVAL,
+    CONF_STREAM_METERS,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_DETAILS_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_POLLING_MODE,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    MAX_ADAPTIVE_INTERVAL,
+    MAX_DETAILS_INTERVAL,
+    MAX_MAX_CONCURRENT_REQUESTS,
     MAX_SCAN_INTERVAL,
+    MIN_DETAILS_INTERVAL,
+    MIN_MAX_CONCURRENT_REQUESTS,
     MIN_SCAN_INTERVAL,
+    POLLING_MODE_ADAPTIVE,
+    POLLING_MODE_FIXED,
 )
+from .session import async_get_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,6 +83,7 @@ class SunologyVaultConfigFlow(ConfigFlow, domain=DOMAIN):
             client = SunologyApiClient(
                 user_input[CONF_EMAIL],
                 user_input[CONF_PASSWORD],
+                session=async_get_session(self.hass),
             )
             try:
                 await client.async_login()
@@ -75,8 +102,6 @@ class SunologyVaultConfigFlow(ConfigFlow, domain=DOMAIN):
                     title="Sunology Stream",
                     data=user_input,
                 )
-            finally:
-                await client.async_close()
 
         return self.async_show_form(
             step_id="user",
@@ -107,6 +132,7 @@ class SunologyVaultConfigFlow(ConfigFlow, domain=DOMAIN):
             client = SunologyApiClient(
                 email,
                 user_input[CONF_PASSWORD],
+                session=async_get_session(self.hass),
             )
             try:
                 await client.async_login()
@@ -127,8 +153,6 @@ class SunologyVaultConfigFlow(ConfigFlow, domain=DOMAIN):
                 )
                 await self.hass.config_entries.async_reload(self._reauth_entry.entry_id)
                 return self.async_abort(reason="reauth_successful")
-            finally:
-                await client.async_close()
 
         return self.async_show_form(
             step_id="reauth_confirm",
@@ -151,12 +175,24 @@ class SunologyVaultOptionsFlow(OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            for key in (CONF_STREAM_METERS, CONF_ERLS):
+                # Drop blank and duplicate ids
+                values = (value.strip() for value in user_input.get(key, []))
+                user_input[key] = list(
+                    dict.fromkeys(value for value in values if value)
+                )
+            if (
+                user_input[CONF_ADAPTIVE_MIN_INTERVAL]
+                > user_input[CONF_ADAPTIVE_MAX_INTERVAL]
+            ):
+                errors["base"] = "invalid_adaptive_interval"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
-        current_interval = self.config_entry.options.get(
-            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-        )
+        options = {**self.config_entry.options, **(user_input or {})}
 
         return self.async_show_form(
             step_id="init",
@@ -164,11 +200,69 @@ class SunologyVaultOptionsFlow(OptionsFlow):
                 {
                     vol.Required(
                         CONF_SCAN_INTERVAL,
-                        default=current_interval,
+                        default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
                     ): vol.All(
                         vol.Coerce(int),
                         vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
                     ),
+                    vol.Required(
+                        CONF_POLLING_MODE,
+                        default=options.get(CONF_POLLING_MODE, DEFAULT_POLLING_MODE),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[POLLING_MODE_FIXED, POLLING_MODE_ADAPTIVE],
+                            translation_key=CONF_POLLING_MODE,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_ADAPTIVE_MIN_INTERVAL,
+                        default=options.get(
+                            CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_ADAPTIVE_INTERVAL),
+                    ),
+                    vol.Required(
+                        CONF_ADAPTIVE_MAX_INTERVAL,
+                        default=options.get(
+                            CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_ADAPTIVE_INTERVAL),
+                    ),
+                    vol.Required(
+                        CONF_DETAILS_INTERVAL,
+                        default=options.get(
+                            CONF_DETAILS_INTERVAL, DEFAULT_DETAILS_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_DETAILS_INTERVAL, max=MAX_DETAILS_INTERVAL),
+                    ),
+                    vol.Required(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(
+                            min=MIN_MAX_CONCURRENT_REQUESTS,
+                            max=MAX_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_STREAM_METERS,
+                        default=options.get(CONF_STREAM_METERS, []),
+                    ): TextSelector(TextSelectorConfig(multiple=True)),
+                    vol.Optional(
+                        CONF_ERLS,
+                        default=options.get(CONF_ERLS, []),
+                    ): TextSelector(TextSelectorConfig(multiple=True)),
                 }
             ),
+            errors=errors,
         )
@@ -2,10 +2,21 @@
 
 DOMAIN = "sunology_vault"
 
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+SIGNAL_BATTERY_UPDATED = f"{DOMAIN}_battery_updated_{{}}"
+
+STORAGE_VERSION = 1
+STORAGE_KEY_SESSION = f"{DOMAIN}.{{}}.session"
+STORAGE_KEY_HISTORY = f"{DOMAIN}.{{}}.history"
+STORAGE_KEY_ENERGY = f"{DOMAIN}.{{}}.energy"
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}.{{}}.snapshot"
+
 BASE_URL = "https://backend-mobile.stream.sunology.eu"
 
 API_HEADERS = {
     "Accept": "application/json, text/plain, */*",
+    "Accept-Encoding": "gzip, deflate",
     "Accept-Language": "fr-FR,fr;q=0.9",
     "App-Version": "2.2.4",
     "Content-Type": "application/json",
@@ -17,7 +28,40 @@ DEFAULT_SCAN_INTERVAL = 60
 MIN_SCAN_INTERVAL = 30
 MAX_SCAN_INTERVAL = 300
 
+CONF_POLLING_MODE = "polling_mode"
+POLLING_MODE_FIXED = "fixed"
+POLLING_MODE_ADAPTIVE = "adaptive"
+DEFAULT_POLLING_MODE = POLLING_MODE_FIXED
+
+CONF_ADAPTIVE_MIN_INTERVAL = "adaptive_min_interval"
+CONF_ADAPTIVE_MAX_INTERVAL = "adaptive_max_interval"
+DEFAULT_ADAPTIVE_MIN_INTERVAL = 30
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 900
+MAX_ADAPTIVE_INTERVAL = 3600
+ADAPTIVE_BACKOFF_FACTOR = 2
+
+CONF_DETAILS_INTERVAL = "details_interval"
+DEFAULT_DETAILS_INTERVAL = 900
+MIN_DETAILS_INTERVAL = 300
+MAX_DETAILS_INTERVAL = 3600
+
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+MIN_MAX_CONCURRENT_REQUESTS = 1
+MAX_MAX_CONCURRENT_REQUESTS = 10
+
+# Connections of the shared session: a full details fan-out, plus an
+# overview poll and a write alongside it
+SESSION_POOL_SIZE = MAX_MAX_CONCURRENT_REQUESTS + 2
+
+CONF_STREAM_METERS = "stream_meters"
+CONF_ERLS = "erls"
+
+DETAILS_REQUEST_TIMEOUT = 15
+WRITE_CACHE_MAX_AGE = 60
+
 BATTERY_CAPACITY_WH = 700
+POWER_ESTIMATION_WINDOW = 900
 
 MIN_THRESHOLD = 210
 MAX_THRESHOLD = 450
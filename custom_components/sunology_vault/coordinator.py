@@ -3,182 +3,932 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass, field
-from datetime import timedelta
+from collections.abc import Callable, Iterable
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime, timedelta
+from functools import partial
 import logging
+import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import ApiError, AuthenticationError, SunologyApiClient
-from .const import DOMAIN, MAX_THRESHOLD, MIN_THRESHOLD
+from .api import ApiError, AuthenticationError, CircuitOpenError, SunologyApiClient
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    BATTERY_CAPACITY_WH,
+    DEFAULT_DETAILS_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DETAILS_REQUEST_TIMEOUT,
+    DOMAIN,
+    MAX_THRESHOLD,
+    MIN_THRESHOLD,
+    POWER_ESTIMATION_WINDOW,
+    SIGNAL_BATTERY_UPDATED,
+    STORAGE_KEY_ENERGY,
+    STORAGE_KEY_HISTORY,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_VERSION,
+    WRITE_CACHE_MAX_AGE,
+)
+from .energy import EnergyAccumulator
+from .estimator import RollingSlope
+from .history import BatteryHistory
+from .metrics import PollMetrics
+from .models import (
+    BATTERY_FIELDS,
+    METER_KIND_ERL,
+    METER_KIND_STREAM_METER,
+    BatteryData,
+    MeterData,
+    SunologyData,
+    apply_details,
+    apply_meters,
+    apply_panel,
+    battery_as_dict,
+    battery_from_dict,
+    battery_snapshot,
+    get_or_default,
+    overview_panels,
+    parse_stations,
+)
+from .profiling import ProfileCapture
+from .scheduler import PRIORITY_WRITE, RequestScheduler
+from .writes import (
+    WRITE_CHECK_INTERVAL,
+    PendingWrite,
+    PendingWriteLedger,
+    StationWriteQueue,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+ACTIVE_BATTERY_STATES = frozenset({"CHARGING", "DISCHARGING"})
+IDLE_BATTERY_STATES = frozenset({"OFF", "UNPLUGGED"})
+SUN_ENTITY_ID = "sun.sun"
+SUN_BELOW_HORIZON = "below_horizon"
+HISTORY_SAVE_DELAY = 300
+ENERGY_SAVE_DELAY = 60
+SNAPSHOT_SAVE_DELAY = 300
 
-def _get_or_default(data: dict[str, Any], key: str, default: Any) -> Any:
-    """Get value from dict, returning default if None or missing."""
-    value = data.get(key)
-    return value if value is not None else default
 
+class SunologyDataUpdateCoordinator(DataUpdateCoordinator[SunologyData]):
+    """Coordinator to fetch data from Sunology API.
 
-@dataclass
-class BatteryData:
-    """Data for a single battery."""
-
-    serial: str
-    name: str
-    station_id: str = ""
-    battery_level: int = 0
-    battery_state: str = ""
-    device_state: str = ""
-    preserve_energy: bool = False
-    threshold: int = 210
-
-
-@dataclass
-class SunologyData:
-    """Data from Sunology API."""
-
-    batteries: dict[str, BatteryData] = field(default_factory=dict)
-
+    Polling is tiered: the overview (battery level and state) is fetched on
+    every tick, while the station list and per-station details (preserve
+    energy, threshold) only change on user action and are refreshed on a
+    slower cadence. Written settings are not read back: the details of the
+    written station alone are fetched again every write check interval,
+    until they confirm the settings or the write expires.
 
-class SunologyDataUpdateCoordinator(DataUpdateCoordinator[SunologyData]):
-    """Coordinator to fetch data from Sunology API."""
+    In adaptive mode, the overview interval drops to its minimum while a
+    battery is charging or discharging, changes state, or a write is
+    queued, and backs off geometrically while every battery is idle, or
+    while the sun is down and no battery is charging or discharging.
+    """
 
     def __init__(
-        self, hass: HomeAssistant, client: SunologyApiClient, scan_interval: int
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: SunologyApiClient,
+        scan_interval: int,
+        details_interval: int = DEFAULT_DETAILS_INTERVAL,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        scheduler: RequestScheduler | None = None,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=entry,
             name=DOMAIN,
             update_interval=timedelta(seconds=scan_interval),
         )
         self.client = client
         self._data = SunologyData()
+        self._scan_interval = scan_interval
+        self._adaptive_interval: tuple[int, int] | None = None
+        self._previous_states: dict[str, str] = {}
+        self._details_interval = details_interval
+        self._details_refreshed_at: float | None = None
+        self._dirty_stations: set[str] = set()
+        self._stale_details: set[str] = set()
+        self._max_concurrent_requests = max_concurrent_requests
+        self._details_fetched_at: dict[str, float] = {}
+        self._write_queues: dict[str, StationWriteQueue] = {}
+        self.pending_writes = PendingWriteLedger()
+        self._write_checks: dict[str, CALLBACK_TYPE] = {}
+        self._published: dict[str, tuple[Any, ...]] = {}
+        self.history: dict[str, BatteryHistory] = {}
+        self._history_store: Store[dict[str, dict[str, str]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_HISTORY.format(entry.entry_id)
+        )
+        self._history_save_pending = False
+        self._power_estimators: dict[str, RollingSlope] = {}
+        self._energy: dict[str, EnergyAccumulator] = {}
+        self._energy_store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_ENERGY.format(entry.entry_id)
+        )
+        self._energy_save_pending = False
+        self._snapshot_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_SNAPSHOT.format(entry.entry_id)
+        )
+        self._snapshot_save_pending = False
+        self._scheduler = scheduler
+        self._phase_generation = scheduler.generation if scheduler else 0
+        self._unsub_phase_refresh: CALLBACK_TYPE | None = None
+        self._battery_listeners: list[Callable[[list[str]], None]] = []
+        self.poll_metrics = PollMetrics()
+        self.profile: ProfileCapture | None = None
+        self._added_serials: list[str] = []
 
     def set_scan_interval(self, scan_interval: int) -> None:
         """Update the scan interval."""
+        self._scan_interval = scan_interval
         self.update_interval = timedelta(seconds=scan_interval)
 
+    def set_adaptive_polling(
+        self, enabled: bool, min_interval: int, max_interval: int
+    ) -> None:
+        """Enable or disable adaptive polling between the given bounds."""
+        if enabled:
+            self._adaptive_interval = (min_interval, max_interval)
+        else:
+            self._adaptive_interval = None
+            self.update_interval = timedelta(seconds=self._scan_interval)
+
+    def set_details_interval(self, details_interval: int) -> None:
+        """Update the station list and details refresh interval."""
+        self._details_interval = details_interval
+
+    def set_max_concurrent_requests(self, max_concurrent_requests: int) -> None:
+        """Update the number of station details fetched concurrently."""
+        self._max_concurrent_requests = max_concurrent_requests
+
+    def set_overview_meters(self, stream_meters: list[str], erls: list[str]) -> None:
+        """Set the STREAM meters and ERLs whose readings the overview requests."""
+        self._data.stream_meters = {
+            meter_id: self._data.stream_meters.get(meter_id)
+            or MeterData(meter_id, METER_KIND_STREAM_METER)
+            for meter_id in stream_meters
+        }
+        self._data.erls = {
+            erl_id: self._data.erls.get(erl_id) or MeterData(erl_id, METER_KIND_ERL)
+            for erl_id in erls
+        }
+
+    @callback
+    def async_add_battery_listener(
+        self, listener: Callable[[list[str]], None]
+    ) -> Callable[[], None]:
+        """Call listener with the serials of batteries added to the account."""
+        self._battery_listeners.append(listener)
+
+        @callback
+        def _async_remove() -> None:
+            self._battery_listeners.remove(listener)
+
+        return _async_remove
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Announce new batteries and publish per-battery changes.
+
+        Coordinator listeners are notified last.
+        """
+        with self._profile_section():
+            if self._added_serials:
+                added, self._added_serials = self._added_serials, []
+                for listener in list(self._battery_listeners):
+                    listener(added)
+            self._async_publish_changes()
+            super().async_update_listeners()
+
+    def _profile_section(self) -> AbstractContextManager[None]:
+        """Return a context profiling its block if a capture is running."""
+        if self.profile is None:
+            return nullcontext()
+        return self.profile.section()
+
+    @callback
+    def _async_publish_changes(self, serials: Iterable[str] | None = None) -> None:
+        """Send the changed fields of each battery since the last publish.
+
+        Only the given batteries are considered, if any.
+        """
+        batteries = self._data.batteries
+        if serials is None:
+            serials = batteries
+        for serial in serials:
+            if (battery := batteries.get(serial)) is None:
+                continue
+            values = battery_snapshot(battery)
+            previous = self._published.get(serial)
+            if values == previous:
+                continue
+            self._published[serial] = values
+            if previous is None:
+                changed = frozenset(BATTERY_FIELDS)
+            else:
+                changed = frozenset(
+                    name
+                    for name, old, new in zip(BATTERY_FIELDS, previous, values)
+                    if old != new
+                )
+            async_dispatcher_send(
+                self.hass, SIGNAL_BATTERY_UPDATED.format(serial), changed
+            )
+
+    async def async_restore(self) -> bool:
+        """Restore battery history, energy totals and the last known data.
+
+        Return True if batteries were restored: the coordinator data is then
+        set to them, flagged stale until the first live refresh.
+        """
+        if (stored := await self._history_store.async_load()) is not None:
+            for serial, snapshot in stored.items():
+                try:
+                    self.history[serial] = BatteryHistory.from_dict(snapshot)
+                except (KeyError, ValueError) as err:
+                    _LOGGER.warning("Discarding invalid history for %s: %s", serial, err)
+
+        if (stored := await self._energy_store.async_load()) is not None:
+            for serial, snapshot in stored.items():
+                try:
+                    self._energy[serial] = EnergyAccumulator.from_dict(snapshot)
+                except (KeyError, TypeError, ValueError) as err:
+                    _LOGGER.warning(
+                        "Discarding invalid energy totals for %s: %s", serial, err
+                    )
+
+        if (stored := await self._snapshot_store.async_load()) is None:
+            return False
+        for serial, snapshot in stored.get("batteries", {}).items():
+            try:
+                battery = battery_from_dict(serial, snapshot)
+            except TypeError as err:
+                _LOGGER.warning("Discarding invalid snapshot for %s: %s", serial, err)
+                continue
+            if (energy := self._energy.get(serial)) is not None:
+                battery.energy_charged = round(energy.charged, 1)
+                battery.energy_discharged = round(energy.discharged, 1)
+            self._data.batteries[serial] = battery
+        for meters, key in (
+            (self._data.stream_meters, "stream_meters"),
+            (self._data.erls, "erls"),
+        ):
+            for meter_id, power in stored.get(key, {}).items():
+                if (meter := meters.get(meter_id)) is not None:
+                    meter.power = power
+        if not self._data.batteries:
+            return False
+        self.data = self._data
+        return True
+
+    @callback
+    def _async_schedule_history_save(self) -> None:
+        """Persist history at most once per save delay."""
+        if self._history_save_pending:
+            return
+        self._history_save_pending = True
+        self._history_store.async_delay_save(self._history_snapshot, HISTORY_SAVE_DELAY)
+
+    @callback
+    def _history_snapshot(self) -> dict[str, dict[str, str]]:
+        """Return the history snapshot to persist."""
+        self._history_save_pending = False
+        return {serial: history.as_dict() for serial, history in self.history.items()}
+
+    @callback
+    def _async_schedule_energy_save(self) -> None:
+        """Persist energy totals at most once per save delay."""
+        if self._energy_save_pending:
+            return
+        self._energy_save_pending = True
+        self._energy_store.async_delay_save(self._energy_snapshot, ENERGY_SAVE_DELAY)
+
+    @callback
+    def _energy_snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the energy totals to persist."""
+        self._energy_save_pending = False
+        return {serial: energy.as_dict() for serial, energy in self._energy.items()}
+
+    @callback
+    def _async_schedule_snapshot_save(self) -> None:
+        """Persist the last known data at most once per save delay."""
+        if self._snapshot_save_pending:
+            return
+        self._snapshot_save_pending = True
+        self._snapshot_store.async_delay_save(
+            self._data_snapshot, SNAPSHOT_SAVE_DELAY
+        )
+
+    @callback
+    def _data_snapshot(self) -> dict[str, Any]:
+        """Return the last known data to persist."""
+        self._snapshot_save_pending = False
+        return {
+            "batteries": {
+                serial: battery_as_dict(battery)
+                for serial, battery in self._data.batteries.items()
+            },
+            "stream_meters": {
+                meter_id: meter.power
+                for meter_id, meter in self._data.stream_meters.items()
+            },
+            "erls": {erl_id: erl.power for erl_id, erl in self._data.erls.items()},
+        }
+
+    def _update_energy(self, battery: BatteryData, now: float) -> None:
+        """Accumulate the energy charged and discharged since the last poll."""
+        if (energy := self._energy.get(battery.serial)) is None:
+            energy = self._energy[battery.serial] = EnergyAccumulator()
+        if battery.device_state == "CONNECTED":
+            state = battery.battery_state
+        else:
+            state = ""
+        energy.update(now, battery.battery_level, state, BATTERY_CAPACITY_WH)
+        battery.energy_charged = round(energy.charged, 1)
+        battery.energy_discharged = round(energy.discharged, 1)
+
+    def _update_power(self, battery: BatteryData, now: float) -> None:
+        """Estimate the battery power from the rolling slope of its level.
+
+        The estimation restarts whenever the battery state changes, so that
+        a window never mixes charge and discharge samples. Power is positive
+        while charging and negative while discharging.
+        """
+        estimator = self._power_estimators.get(battery.serial)
+        if estimator is None:
+            estimator = self._power_estimators[battery.serial] = RollingSlope(
+                POWER_ESTIMATION_WINDOW
+            )
+        if self._previous_states.get(battery.serial) != battery.battery_state:
+            estimator.reset()
+        estimator.add(now, battery.battery_level)
+
+        if battery.battery_state == "OFF":
+            battery.power = 0.0
+        elif battery.battery_state not in ACTIVE_BATTERY_STATES:
+            battery.power = None
+        elif (slope := estimator.slope()) is None:
+            battery.power = None
+        else:
+            # %/s to W
+            power = slope * BATTERY_CAPACITY_WH / 100 * 3600
+            if battery.battery_state == "CHARGING":
+                battery.power = round(max(power, 0.0), 1)
+            else:
+                battery.power = round(min(power, 0.0), 1)
+
+    def _writes_pending(self) -> bool:
+        """Return True if a write is queued or a station must be re-read."""
+        return bool(self._dirty_stations) or any(
+            queue.pending is not None for queue in self._write_queues.values()
+        )
+
+    def _adapt_update_interval(self, min_interval: int, max_interval: int) -> None:
+        """Pick the next overview interval from battery activity and time of day."""
+        batteries = self._data.batteries.values()
+        transition = any(
+            self._previous_states.get(battery.serial, battery.battery_state)
+            != battery.battery_state
+            for battery in batteries
+        )
+        sun = self.hass.states.get(SUN_ENTITY_ID)
+        night = sun is not None and sun.state == SUN_BELOW_HORIZON
+        current = (
+            self.update_interval.total_seconds()
+            if self.update_interval
+            else self._scan_interval
+        )
+
+        # An active battery keeps the minimum interval even at night, so that
+        # its power estimation window always holds several samples
+        if (
+            self._writes_pending()
+            or transition
+            or any(battery.battery_state in ACTIVE_BATTERY_STATES for battery in batteries)
+        ):
+            interval = min_interval
+        elif night or all(
+            battery.battery_state in IDLE_BATTERY_STATES for battery in batteries
+        ):
+            interval = min(
+                max(current, min_interval) * ADAPTIVE_BACKOFF_FACTOR, max_interval
+            )
+        else:
+            interval = min(max(self._scan_interval, min_interval), max_interval)
+
+        if interval != current:
+            _LOGGER.debug("Adaptive polling: next update in %s seconds", interval)
+            self.update_interval = timedelta(seconds=interval)
+
+    def _details_due(self) -> bool:
+        """Return True if the station list and details must be refreshed."""
+        if self._details_refreshed_at is None:
+            return True
+        return time.monotonic() - self._details_refreshed_at >= self._details_interval
+
+    def _phase_delay(self) -> float | None:
+        """Return the delay to the phase assigned by the scheduler, if it moved.
+
+        This happens once each time accounts are added or removed.
+        """
+        if (
+            self._scheduler is None
+            or self._phase_generation == self._scheduler.generation
+            or self.update_interval is None
+        ):
+            return None
+        self._phase_generation = self._scheduler.generation
+        delay = self._scheduler.phase_delay(
+            self.config_entry.entry_id, self.update_interval.total_seconds()
+        )
+        return delay if delay > 0 else None
+
+    @callback
+    def _async_schedule_phase_refresh(self) -> None:
+        """Request a refresh on the scheduler's phase, if it moved.
+
+        The phase comes before the next scheduled refresh, and later
+        refreshes are scheduled relative to the end of the requested one,
+        so the whole polling timeline shifts without holding an update open.
+        """
+        if (delay := self._phase_delay()) is None:
+            return
+        _LOGGER.debug("Moving next poll to %.1f seconds to spread accounts", delay)
+        if self._unsub_phase_refresh is not None:
+            self._unsub_phase_refresh()
+        self._unsub_phase_refresh = async_call_later(
+            self.hass, delay, self._async_fire_phase_refresh
+        )
+
+    @callback
+    def _async_fire_phase_refresh(self, _now: datetime) -> None:
+        """Hand the refresh on the scheduler's phase over to a task."""
+        self._unsub_phase_refresh = None
+        self.hass.async_create_task(self.async_request_refresh())
+
     async def _async_update_data(self) -> SunologyData:
+        """Fetch data from API, recording the duration of the poll."""
+        metrics = self.poll_metrics
+        metrics.polls += 1
+        start = time.monotonic()
+        profile = self.profile
+        try:
+            with self._profile_section():
+                data = await self._async_poll()
+        except Exception:
+            metrics.failed_polls += 1
+            raise
+        finally:
+            metrics.duration_ms = (time.monotonic() - start) * 1000
+            if profile is not None:
+                profile.poll_done()
+        self._async_schedule_phase_refresh()
+        return data
+
+    async def _async_poll(self) -> SunologyData:
         """Fetch data from API."""
         try:
-            stations = await self.client.async_get_stations()
-            overview = await self.client.async_get_overview()
-
-            # Fetch all station details in parallel
-            details_tasks = [
-                self.client.async_get_station_details(station["id"])
-                for station in stations
-            ]
-            all_details = await asyncio.gather(*details_tasks)
-
-            panels = overview.get("production", {}).get("panels", {})
-
-            for station, details in zip(stations, all_details):
-                serial = station["serialNumber"]
-                station_id = station["id"]
-                name = station.get("name", serial)
-
-                panel_data = panels.get(serial, {})
-                current_level = panel_data.get("battery", 0)
-                battery_state = panel_data.get("batteryState", "")
-                device_state = panel_data.get("deviceState", "")
-
-                preserve_energy = _get_or_default(details, "batteryPreserveEnergy", False)
-                threshold = _get_or_default(details, "batteryThreshold", 210)
-
-                if serial not in self._data.batteries:
-                    self._data.batteries[serial] = BatteryData(
-                        serial=serial,
-                        name=name,
-                        station_id=station_id,
-                        battery_level=current_level,
-                        battery_state=battery_state,
-                        device_state=device_state,
-                        preserve_energy=preserve_energy,
-                        threshold=threshold,
-                    )
-                else:
-                    battery = self._data.batteries[serial]
-                    battery.name = name
-                    battery.station_id = station_id
-                    battery.battery_level = current_level
-                    battery.battery_state = battery_state
-                    battery.device_state = device_state
-                    battery.preserve_energy = preserve_energy
-                    battery.threshold = threshold
+            if self._details_due():
+                try:
+                    await self._async_refresh_stations()
+                except CircuitOpenError:
+                    if not self._data.batteries:
+                        raise
+                    _LOGGER.debug("Station list suspended, keeping known stations")
+            elif self._dirty_stations:
+                await self._async_refresh_details(
+                    [
+                        battery
+                        for battery in self._data.batteries.values()
+                        if battery.serial in self._dirty_stations
+                    ]
+                )
+
+            overview_start = time.monotonic()
+            # New batteries need their panel applied, even if the overview
+            # did not change since they were last seen in it
+            overview = await self.client.async_get_overview(
+                list(self._data.stream_meters),
+                list(self._data.erls),
+                only_if_changed=not self._added_serials,
+            )
+            parse_start = time.monotonic()
+            self.poll_metrics.overview_ms = (parse_start - overview_start) * 1000
+            if overview is None:
+                # Same live data as the last poll: only time-based updates
+                self.poll_metrics.skipped_polls += 1
+                panels = None
+            else:
+                panels = overview_panels(overview)
+                apply_meters(self._data.stream_meters, overview.get("streamMeters"))
+                apply_meters(self._data.erls, overview.get("erls"))
+
+            now = time.time()
+            for serial, battery in self._data.batteries.items():
+                if panels is not None:
+                    apply_panel(battery, panels.get(serial))
+                battery.stale = serial in self._stale_details
+                if (history := self.history.get(serial)) is None:
+                    history = self.history[serial] = BatteryHistory()
+                history.append(now, battery.battery_level, battery.battery_state)
+                self._update_power(battery, now)
+                self._update_energy(battery, now)
+            self.poll_metrics.parse_ms = (time.monotonic() - parse_start) * 1000
+            self._async_schedule_history_save()
+            self._async_schedule_energy_save()
+            self._async_schedule_snapshot_save()
 
+            if self._adaptive_interval is not None:
+                self._adapt_update_interval(*self._adaptive_interval)
+            self._previous_states = {
+                serial: battery.battery_state
+                for serial, battery in self._data.batteries.items()
+            }
             return self._data
 
         except AuthenticationError as err:
             raise ConfigEntryAuthFailed from err
+        except CircuitOpenError as err:
+            if not self._data.batteries:
+                raise UpdateFailed(f"Error communicating with API: {err}") from err
+            # Serve last-known values until the backend recovers
+            _LOGGER.debug("Overview suspended, serving last-known values: %s", err)
+            for battery in self._data.batteries.values():
+                battery.stale = True
+            return self._data
         except ApiError as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
-    async def async_set_preserve_energy(self, serial: str, value: bool) -> None:
-        """Set preserve energy mode."""
-        battery = self._data.batteries.get(serial)
-        if not battery:
+    async def _async_refresh_stations(self) -> None:
+        """Refresh the station list and the details of every station.
+
+        Batteries new to the account are announced to the platforms on the
+        next listener update. Batteries no longer listed are forgotten, unless
+        the list is empty, which more likely denotes a backend glitch.
+        """
+        stations = await self.client.async_get_stations()
+        known = set(self._data.batteries)
+        batteries = parse_stations(stations, self._data.batteries)
+        listed = {battery.serial for battery in batteries}
+        self._added_serials.extend(
+            battery.serial for battery in batteries if battery.serial not in known
+        )
+        if batteries:
+            for serial in known - listed:
+                self._async_remove_battery(serial)
+        await self._async_refresh_details(batteries)
+        self._details_refreshed_at = time.monotonic()
+
+    @callback
+    def _async_remove_battery(self, serial: str) -> None:
+        """Forget a battery removed from the account, and its device."""
+        _LOGGER.info("Battery %s is no longer part of the account, removing it", serial)
+        del self._data.batteries[serial]
+        for mapping in (
+            self.history,
+            self._power_estimators,
+            self._energy,
+            self._published,
+            self._previous_states,
+            self._details_fetched_at,
+        ):
+            mapping.pop(serial, None)
+        self._dirty_stations.discard(serial)
+        self._stale_details.discard(serial)
+        self.pending_writes.forget(serial)
+        if (queue := self._write_queues.pop(serial, None)) is not None:
+            queue.async_cancel()
+        if (unsub := self._write_checks.pop(serial, None)) is not None:
+            unsub()
+
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(identifiers={(DOMAIN, serial)}):
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=self.config_entry.entry_id
+            )
+
+    async def _async_refresh_details(
+        self, batteries: list[BatteryData], record_duration: bool = True
+    ) -> None:
+        """Refresh preserve energy and threshold for the given batteries.
+
+        Details are fetched with bounded concurrency and a per-station
+        deadline. A station that fails keeps its last-known values, is
+        flagged stale and stays due for refresh on the next tick. The
+        duration is recorded as the details fan-out one, if record_duration.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+
+        async def _async_fetch(battery: BatteryData) -> dict[str, Any] | None:
+            async with semaphore, asyncio.timeout(DETAILS_REQUEST_TIMEOUT):
+                # Pending writes are checked against the details, even unchanged
+                return await self.client.async_get_station_details(
+                    battery.station_id,
+                    only_if_changed=not self.pending_writes.has_pending(
+                        battery.serial
+                    ),
+                )
+
+        start = time.monotonic()
+        all_details = await asyncio.gather(
+            *(_async_fetch(battery) for battery in batteries),
+            return_exceptions=True,
+        )
+        if record_duration:
+            self.poll_metrics.details_ms = (time.monotonic() - start) * 1000
+
+        for battery, details in zip(batteries, all_details):
+            if isinstance(details, (ApiError, TimeoutError)):
+                _LOGGER.debug(
+                    "Failed to fetch details for %s, keeping last-known values: %r",
+                    battery.serial,
+                    details,
+                )
+                battery.stale = True
+                self._stale_details.add(battery.serial)
+                self._dirty_stations.add(battery.serial)
+                continue
+            if isinstance(details, BaseException):
+                raise details
+            now = time.monotonic()
+            if details is not None:
+                apply_details(battery, details)
+                self.pending_writes.reconcile(battery, now)
+            battery.stale = False
+            self._stale_details.discard(battery.serial)
+            self._details_fetched_at[battery.serial] = now
+            self._dirty_stations.discard(battery.serial)
+
+    async def async_refresh_station(self, serial: str) -> None:
+        """Refresh the settings of a single station now.
+
+        Only its details are fetched, and only its entities are notified.
+        """
+        if (battery := self._data.batteries.get(serial)) is None:
             raise HomeAssistantError(f"Battery {serial} not found")
         try:
-            # GET current state to avoid overwriting stale values
-            details = await self.client.async_get_station_details(battery.station_id)
-            current_threshold = _get_or_default(details, "batteryThreshold", battery.threshold)
-
-            response = await self.client.async_update_station(
-                battery.station_id,
-                battery.serial,
-                battery.name,
-                preserve_energy=value,
-                threshold=current_threshold,
-            )
-            # Update local state from API response
-            if response.get("batteryPreserveEnergy") is not None:
-                battery.preserve_energy = response["batteryPreserveEnergy"]
-            if response.get("batteryThreshold") is not None:
-                battery.threshold = response["batteryThreshold"]
+            await self._async_refresh_details([battery], record_duration=False)
+        except AuthenticationError as err:
+            self.config_entry.async_start_reauth(self.hass)
+            raise HomeAssistantError(f"Failed to refresh {serial}: {err}") from err
+        self._async_publish_changes([serial])
+        if serial in self._stale_details:
+            raise HomeAssistantError(f"Failed to refresh {serial}")
+
+    @callback
+    def _async_schedule_write_check(self, serial: str) -> None:
+        """Check the settings written to a station after the check interval."""
+        if (unsub := self._write_checks.pop(serial, None)) is not None:
+            unsub()
+        self._write_checks[serial] = async_call_later(
+            self.hass,
+            WRITE_CHECK_INTERVAL,
+            partial(self._async_fire_write_check, serial),
+        )
+
+    @callback
+    def _async_fire_write_check(self, serial: str, _now: datetime) -> None:
+        """Hand the check of the settings written to a station over to a task."""
+        self._write_checks.pop(serial, None)
+        self.hass.async_create_task(self._async_check_writes(serial))
+
+    async def _async_check_writes(self, serial: str) -> None:
+        """Refresh a station until its written settings are confirmed or expire."""
+        if not self.pending_writes.has_pending(serial):
+            return
+        try:
+            await self.async_refresh_station(serial)
+        except HomeAssistantError as err:
+            _LOGGER.debug("Failed to check the settings written to %s: %s", serial, err)
+        if self.pending_writes.has_pending(serial) and serial not in self._write_checks:
+            self._async_schedule_write_check(serial)
+
+    async def async_refresh_all(self) -> None:
+        """Refresh the station list, every station's details and live data now."""
+        self._details_refreshed_at = None
+        await self.async_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending writes and timers, flush delayed saves and shut down.
+
+        Saving now replaces the delayed writes, so that a reload restores
+        the latest totals and a removed entry is not written again.
+        """
+        for queue in self._write_queues.values():
+            queue.async_cancel()
+        for unsub in self._write_checks.values():
+            unsub()
+        self._write_checks.clear()
+        if self._unsub_phase_refresh is not None:
+            self._unsub_phase_refresh()
+            self._unsub_phase_refresh = None
+        if self._history_save_pending:
+            await self._history_store.async_save(self._history_snapshot())
+        if self._energy_save_pending:
+            await self._energy_store.async_save(self._energy_snapshot())
+        if self._snapshot_save_pending:
+            await self._snapshot_store.async_save(self._data_snapshot())
+        await super().async_shutdown()
+
+    def _details_fresh(self, serial: str) -> bool:
+        """Return True if the cached details of a station can be trusted."""
+        fetched_at = self._details_fetched_at.get(serial)
+        return (
+            fetched_at is not None
+            and time.monotonic() - fetched_at < WRITE_CACHE_MAX_AGE
+        )
+
+    async def _async_write_settings(
+        self, serial: str, pending: PendingWrite, notify: bool = True
+    ) -> None:
+        """Write merged settings to a station in a single PATCH.
+
+        The written settings are applied optimistically and recorded as
+        pending until the station details, checked after the write check
+        interval, confirm them. Listeners are notified, unless notify is
+        False.
+        """
+        with self._profile_section():
+            await self._async_send_settings(serial, pending, notify)
+
+    async def _async_send_settings(
+        self, serial: str, pending: PendingWrite, notify: bool
+    ) -> None:
+        """Write merged settings to a station."""
+        battery = self._data.batteries[serial]
+        preserve_energy = pending.preserve_energy
+        threshold = pending.threshold
+        ledger = self.pending_writes
+        # Keep settings written earlier and not confirmed yet as written
+        if preserve_energy is None and ledger.is_pending(serial, "preserve_energy"):
+            preserve_energy = battery.preserve_energy
+        if threshold is None and ledger.is_pending(serial, "threshold"):
+            threshold = battery.threshold
+
+        if preserve_energy is None or threshold is None:
+            if self._details_fresh(serial):
+                current_preserve = battery.preserve_energy
+                current_threshold = battery.threshold
+            else:
+                # GET current state to avoid overwriting stale values
+                details = await self.client.async_get_station_details(
+                    battery.station_id, priority=PRIORITY_WRITE
+                )
+                current_preserve = get_or_default(
+                    details, "batteryPreserveEnergy", battery.preserve_energy
+                )
+                current_threshold = get_or_default(
+                    details, "batteryThreshold", battery.threshold
+                )
+            if preserve_energy is None:
+                preserve_energy = current_preserve
+            if threshold is None:
+                threshold = current_threshold
+
+        response = await self.client.async_update_station(
+            battery.station_id,
+            battery.serial,
+            battery.name,
+            preserve_energy=preserve_energy,
+            threshold=threshold,
+        )
+        now = time.monotonic()
+        if pending.preserve_energy is not None:
+            ledger.record(battery, "preserve_energy", pending.preserve_energy, now)
+        if pending.threshold is not None:
+            ledger.record(battery, "threshold", pending.threshold, now)
+        self._async_schedule_write_check(serial)
+        if (
+            response.get("batteryPreserveEnergy") is not None
+            and response.get("batteryThreshold") is not None
+        ):
+            # The response carries the full settings, which can be merged
+            # into the next write without reading them first
+            self._details_fetched_at[serial] = now
+        if notify:
             self.async_set_updated_data(self._data)
+
+    def _write_queue(self, serial: str) -> StationWriteQueue:
+        """Return the write queue of a station."""
+        if (queue := self._write_queues.get(serial)) is None:
+
+            async def _async_flush(pending: PendingWrite) -> None:
+                await self._async_write_settings(serial, pending)
+
+            queue = self._write_queues[serial] = StationWriteQueue(
+                self.hass, _async_flush
+            )
+        return queue
+
+    async def _async_queue_write(
+        self,
+        serial: str,
+        preserve_energy: bool | None = None,
+        threshold: int | None = None,
+    ) -> None:
+        """Queue a settings change and wait until it is written."""
+        if (battery := self._data.batteries.get(serial)) is None:
+            raise HomeAssistantError(f"Battery {serial} not found")
+        queue = self._write_queue(serial)
+        if queue.pending is None and all(
+            value is None
+            or (
+                self.pending_writes.is_pending(serial, setting)
+                and getattr(battery, setting) == value
+            )
+            for setting, value in (
+                ("preserve_energy", preserve_energy),
+                ("threshold", threshold),
+            )
+        ):
+            # Already written, waiting for the cloud to apply it
+            return
+        try:
+            await queue.async_enqueue(
+                preserve_energy=preserve_energy, threshold=threshold
+            )
         except AuthenticationError as err:
             raise ConfigEntryAuthFailed from err
         except ApiError as err:
-            _LOGGER.error("Failed to set preserve energy for %s: %s", serial, err)
+            _LOGGER.error("Failed to update settings for %s: %s", serial, err)
             raise HomeAssistantError(f"Failed to update setting: {err}") from err
 
+    async def async_set_preserve_energy(self, serial: str, value: bool) -> None:
+        """Set preserve energy mode."""
+        await self._async_queue_write(serial, preserve_energy=value)
+
     async def async_set_threshold(self, serial: str, value: int) -> None:
         """Set charge threshold."""
         if not MIN_THRESHOLD <= value <= MAX_THRESHOLD:
             raise HomeAssistantError(
                 f"Threshold must be between {MIN_THRESHOLD} and {MAX_THRESHOLD}"
             )
-        battery = self._data.batteries.get(serial)
-        if not battery:
-            raise HomeAssistantError(f"Battery {serial} not found")
-        try:
-            # GET current state to avoid overwriting stale values
-            details = await self.client.async_get_station_details(battery.station_id)
-            current_preserve = _get_or_default(details, "batteryPreserveEnergy", battery.preserve_energy)
-
-            response = await self.client.async_update_station(
-                battery.station_id,
-                battery.serial,
-                battery.name,
-                preserve_energy=current_preserve,
-                threshold=value,
-            )
-            # Update local state from API response
-            if response.get("batteryPreserveEnergy") is not None:
-                battery.preserve_energy = response["batteryPreserveEnergy"]
-            if response.get("batteryThreshold") is not None:
-                battery.threshold = response["batteryThreshold"]
+        await self._async_queue_write(serial, threshold=value)
+
+    def _settings_match(
+        self, serial: str, preserve_energy: bool | None, threshold: int | None
+    ) -> bool:
+        """Return True if the cached settings of a station are the given ones."""
+        battery = self._data.batteries[serial]
+        if battery.stale or serial in self._dirty_stations:
+            return False
+        return (
+            preserve_energy is None or preserve_energy == battery.preserve_energy
+        ) and (threshold is None or threshold == battery.threshold)
+
+    async def async_apply_fleet_settings(
+        self, settings: dict[str, PendingWrite]
+    ) -> dict[str, dict[str, Any]]:
+        """Apply settings to several batteries and return the outcome of each.
+
+        Batteries whose cached settings already match are skipped. The others
+        are written concurrently, within the concurrency limit, and listeners
+        are notified once at the end. Written settings are confirmed by the
+        details checked after the write check interval, not read back.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+
+        async def _async_apply(serial: str, pending: PendingWrite) -> dict[str, Any]:
+            if self._settings_match(serial, pending.preserve_energy, pending.threshold):
+                return {"status": "unchanged"}
+            async with semaphore:
+                # Writes go through the station queue, so they never overlap
+                # with a debounced write to the same station
+                await self._write_queue(serial).async_write_now(
+                    partial(self._async_write_settings, serial, pending, notify=False)
+                )
+            return {"status": "updated"}
+
+        outcomes = await asyncio.gather(
+            *(_async_apply(serial, pending) for serial, pending in settings.items()),
+            return_exceptions=True,
+        )
+
+        results: dict[str, dict[str, Any]] = {}
+        for serial, outcome in zip(settings, outcomes):
+            if isinstance(outcome, AuthenticationError):
+                self.config_entry.async_start_reauth(self.hass)
+                outcome = {"status": "failed", "error": str(outcome)}
+            elif isinstance(outcome, ApiError):
+                _LOGGER.error("Failed to update settings for %s: %s", serial, outcome)
+                outcome = {"status": "failed", "error": str(outcome)}
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            results[serial] = outcome
+
+        if any(result["status"] == "updated" for result in results.values()):
             self.async_set_updated_data(self._data)
-        except AuthenticationError as err:
-            raise ConfigEntryAuthFailed from err
-        except ApiError as err:
-            _LOGGER.error("Failed to set threshold for %s: %s", serial, err)
-            raise HomeAssistantError(f"Failed to update setting: {err}") from err
+        return results
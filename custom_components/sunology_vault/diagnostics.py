@@ -0,0 +1,49 @@
+"""Diagnostics support for Sunology VAULT."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import SunologyDataUpdateCoordinator
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, "username", "email", "Cookie"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: SunologyDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "batteries": {
+            serial: asdict(battery)
+            for serial, battery in coordinator.data.batteries.items()
+        },
+        "stream_meters": {
+            meter_id: asdict(meter)
+            for meter_id, meter in coordinator.data.stream_meters.items()
+        },
+        "erls": {
+            erl_id: asdict(erl) for erl_id, erl in coordinator.data.erls.items()
+        },
+        "metrics": {
+            "poll": asdict(coordinator.poll_metrics),
+            "endpoints": coordinator.client.metrics.as_dict(),
+        },
+        "pending_writes": coordinator.pending_writes.as_dict(time.monotonic()),
+        "open_circuits": coordinator.client.open_circuits,
+        "api_traces": async_redact_data(coordinator.client.tracer.as_list(), TO_REDACT),
+    }
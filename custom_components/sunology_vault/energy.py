@@ -0,0 +1,65 @@
+"""Incremental charged/discharged energy totals."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# Level changes over a longer gap (e.g. Home Assistant was stopped) are not
+# attributed: they may hide several charge/discharge cycles.
+ENERGY_MAX_GAP = 7200
+
+COUNTED_BATTERY_STATES = frozenset({"OFF", "CHARGING", "DISCHARGING"})
+
+
+@dataclass(slots=True)
+class EnergyAccumulator:
+    """Energy charged into and discharged from a battery, in Wh.
+
+    Totals are integrated from level deltas between consecutive polls. The
+    last level is persisted together with the totals, so a restart resumes
+    from the same baseline without losing or double-counting energy.
+    """
+
+    charged: float = 0.0
+    discharged: float = 0.0
+    last_level: int | None = None
+    last_timestamp: float | None = None
+
+    def update(
+        self, timestamp: float, level: int, state: str, capacity_wh: float
+    ) -> None:
+        """Account for the level change since the previous sample."""
+        if state not in COUNTED_BATTERY_STATES:
+            # Unplugged or unknown: the level is not meaningful
+            self.last_level = None
+            self.last_timestamp = None
+            return
+
+        if (
+            self.last_level is not None
+            and self.last_timestamp is not None
+            and 0 <= timestamp - self.last_timestamp <= ENERGY_MAX_GAP
+        ):
+            delta = (level - self.last_level) * capacity_wh / 100
+            if delta > 0:
+                self.charged += delta
+            elif delta < 0:
+                self.discharged -= delta
+
+        self.last_level = level
+        self.last_timestamp = timestamp
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EnergyAccumulator:
+        """Restore an accumulator from a snapshot."""
+        return cls(
+            charged=float(data["charged"]),
+            discharged=float(data["discharged"]),
+            last_level=data.get("last_level"),
+            last_timestamp=data.get("last_timestamp"),
+        )
@@ -2,18 +2,29 @@
 
 from __future__ import annotations
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .coordinator import BatteryData, SunologyDataUpdateCoordinator
+from .const import DOMAIN, SIGNAL_BATTERY_UPDATED
+from .coordinator import SunologyDataUpdateCoordinator
+from .models import METER_KIND_STREAM_METER, BatteryData, MeterData
 
 
 class SunologyVaultEntity(CoordinatorEntity[SunologyDataUpdateCoordinator]):
-    """Base class for Sunology VAULT entities."""
+    """Base class for Sunology VAULT entities.
+
+    State is only written when one of the battery fields the entity depends
+    on changed, when its availability changed, or when the battery values
+    became stale (last known) or live again.
+    """
 
     _attr_has_entity_name = True
     _available_when_unplugged = False
+    _watched_fields: frozenset[str] = frozenset()
 
     def __init__(
         self, coordinator: SunologyDataUpdateCoordinator, serial: str
@@ -21,6 +32,7 @@ class SunologyVaultEntity(CoordinatorEntity[SunologyDataUpdateCoordinator]):
         """Initialize the entity."""
         super().__init__(coordinator)
         self._serial = serial
+        self._published_available: bool | None = None
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, serial)},
             name=coordinator.data.batteries[serial].name,
@@ -29,11 +41,48 @@ class SunologyVaultEntity(CoordinatorEntity[SunologyDataUpdateCoordinator]):
             model="VAULT",
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to changes of this entity's battery."""
+        await super().async_added_to_hass()
+        self._published_available = self.available
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_BATTERY_UPDATED.format(self._serial),
+                self._async_battery_updated,
+            )
+        )
+
+    @callback
+    def _async_battery_updated(self, changed: frozenset[str]) -> None:
+        """Write state if a watched field of the battery changed."""
+        if changed.isdisjoint(
+            self._watched_fields | {"device_state", "battery_state", "stale"}
+        ):
+            return
+        self._published_available = self.available
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the coordinator availability changed it."""
+        if (available := self.available) != self._published_available:
+            self._published_available = available
+            self.async_write_ha_state()
+
     @property
     def _battery_data(self) -> BatteryData | None:
         """Get battery data for this entity."""
         return self.coordinator.data.batteries.get(self._serial)
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return whether the values are last known ones, not live data."""
+        battery = self._battery_data
+        if battery:
+            return {"stale": battery.stale}
+        return None
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
@@ -45,3 +94,53 @@ class SunologyVaultEntity(CoordinatorEntity[SunologyDataUpdateCoordinator]):
         if not self._available_when_unplugged and battery.battery_state == "UNPLUGGED":
             return False
         return True
+
+
+class SunologyMeterEntity(CoordinatorEntity[SunologyDataUpdateCoordinator]):
+    """Base class for STREAM meter and ERL entities."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self, coordinator: SunologyDataUpdateCoordinator, meter: MeterData
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._meter_id = meter.id
+        self._kind = meter.kind
+        model = "STREAM Meter" if meter.kind == METER_KIND_STREAM_METER else "ERL"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{meter.kind}_{meter.id}")},
+            name=f"{model} {meter.id}",
+            serial_number=meter.id,
+            manufacturer="Sunology",
+            model=model,
+        )
+
+    @property
+    def _meter_data(self) -> MeterData | None:
+        """Get the data of this entity's meter."""
+        meters = (
+            self.coordinator.data.stream_meters
+            if self._kind == METER_KIND_STREAM_METER
+            else self.coordinator.data.erls
+        )
+        return meters.get(self._meter_id)
+
+
+class SunologyAccountEntity(CoordinatorEntity[SunologyDataUpdateCoordinator]):
+    """Base class for entities of the Sunology account itself."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: SunologyDataUpdateCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        entry = coordinator.config_entry
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Sunology",
+            model="Account",
+            entry_type=DeviceEntryType.SERVICE,
+        )
@@ -0,0 +1,78 @@
+"""Incremental rate estimation for battery levels."""
+
+from __future__ import annotations
+
+from collections import deque
+
+# Sums are rebased once sample times grow past this many seconds, to keep
+# the squared terms well within float precision.
+REBASE_AFTER = 86400.0
+
+
+class RollingSlope:
+    """Least-squares slope of samples over a sliding time window.
+
+    Running sums are updated as samples enter and leave the window, so each
+    update costs O(1) amortized time regardless of the window length.
+    """
+
+    __slots__ = ("_window", "_samples", "_origin", "_sx", "_sy", "_sxx", "_sxy")
+
+    def __init__(self, window: float) -> None:
+        """Initialize the estimator for a window in seconds."""
+        self._window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        self._origin = 0.0
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self._samples.clear()
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample and drop the ones that left the window."""
+        if not self._samples:
+            self._origin = timestamp
+        elif timestamp - self._origin > REBASE_AFTER:
+            self._rebase()
+        x = timestamp - self._origin
+        self._samples.append((x, value))
+        self._sx += x
+        self._sy += value
+        self._sxx += x * x
+        self._sxy += x * value
+
+        while self._samples and self._samples[0][0] < x - self._window:
+            old_x, old_value = self._samples.popleft()
+            self._sx -= old_x
+            self._sy -= old_value
+            self._sxx -= old_x * old_x
+            self._sxy -= old_x * old_value
+
+    def slope(self) -> float | None:
+        """Return the slope in value units per second, None if undetermined."""
+        n = len(self._samples)
+        if n < 2:
+            return None
+        denominator = n * self._sxx - self._sx * self._sx
+        if denominator <= 0:
+            return None
+        return (n * self._sxy - self._sx * self._sy) / denominator
+
+    def _rebase(self) -> None:
+        """Move the origin to the oldest sample and recompute the sums."""
+        shift = self._samples[0][0]
+        self._origin += shift
+        samples = [(x - shift, value) for x, value in self._samples]
+        self.reset()
+        self._samples.extend(samples)
+        for x, value in samples:
+            self._sx += x
+            self._sy += value
+            self._sxx += x * x
+            self._sxy += x * value
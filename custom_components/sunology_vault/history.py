@@ -0,0 +1,123 @@
+"""Compact in-memory history of battery samples."""
+
+from __future__ import annotations
+
+from array import array
+import base64
+from collections.abc import Iterator
+import sys
+from typing import Any
+
+HISTORY_SIZE = 2880
+
+BATTERY_STATE_CODES = {"": 0, "OFF": 1, "CHARGING": 2, "DISCHARGING": 3, "UNPLUGGED": 4}
+BATTERY_STATES = {code: state for state, code in BATTERY_STATE_CODES.items()}
+
+
+class BatteryHistory:
+    """Fixed-size ring buffer of (timestamp, battery level, battery state).
+
+    Samples are stored in typed arrays (10 bytes per sample), so a full
+    buffer of 48 hours at 60 seconds is under 30 kB per battery.
+    """
+
+    __slots__ = ("_size", "_timestamps", "_levels", "_states", "_start", "_count")
+
+    def __init__(self, size: int = HISTORY_SIZE) -> None:
+        """Initialize an empty history."""
+        self._size = size
+        self._timestamps = array("d", bytes(8 * size))
+        self._levels = array("B", bytes(size))
+        self._states = array("B", bytes(size))
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return self._count
+
+    def append(self, timestamp: float, level: int, state: str) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        if self._count < self._size:
+            index = (self._start + self._count) % self._size
+            self._count += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self._size
+        self._timestamps[index] = timestamp
+        self._levels[index] = max(0, min(level, 255))
+        self._states[index] = BATTERY_STATE_CODES.get(state, 0)
+
+    def samples(self, since: float = 0) -> Iterator[tuple[float, int, int]]:
+        """Yield (timestamp, level, state code) samples newer than since, oldest first."""
+        for offset in range(self._count):
+            index = (self._start + offset) % self._size
+            timestamp = self._timestamps[index]
+            if timestamp >= since:
+                yield timestamp, self._levels[index], self._states[index]
+
+    def downsample(self, start: float, end: float, buckets: int) -> list[dict[str, Any]]:
+        """Aggregate samples between start and end into min/max/avg buckets.
+
+        Empty buckets are omitted. The state of a bucket is the last one seen.
+        """
+        width = (end - start) / buckets
+        stats: dict[int, list[Any]] = {}
+        for timestamp, level, state in self.samples(start):
+            if timestamp > end:
+                break
+            bucket = min(int((timestamp - start) / width), buckets - 1)
+            if (entry := stats.get(bucket)) is None:
+                stats[bucket] = [level, level, level, 1, state]
+                continue
+            entry[0] = min(entry[0], level)
+            entry[1] = max(entry[1], level)
+            entry[2] += level
+            entry[3] += 1
+            entry[4] = state
+        return [
+            {
+                "start": start + bucket * width,
+                "end": start + (bucket + 1) * width,
+                "min": low,
+                "max": high,
+                "avg": round(total / count, 1),
+                "state": BATTERY_STATES.get(state, ""),
+            }
+            for bucket, (low, high, total, count, state) in sorted(stats.items())
+        ]
+
+    def as_dict(self) -> dict[str, str]:
+        """Return a compact, JSON-serializable snapshot."""
+        order = [(self._start + offset) % self._size for offset in range(self._count)]
+        return {
+            "byteorder": sys.byteorder,
+            "timestamps": _encode(array("d", (self._timestamps[i] for i in order))),
+            "levels": _encode(array("B", (self._levels[i] for i in order))),
+            "states": _encode(array("B", (self._states[i] for i in order))),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str], size: int = HISTORY_SIZE) -> BatteryHistory:
+        """Restore a history from a snapshot."""
+        history = cls(size)
+        timestamps = _decode("d", data["timestamps"])
+        if data.get("byteorder", sys.byteorder) != sys.byteorder:
+            timestamps.byteswap()
+        levels = _decode("B", data["levels"])
+        states = _decode("B", data["states"])
+        for timestamp, level, state in zip(timestamps, levels, states):
+            history.append(timestamp, level, BATTERY_STATES.get(state, ""))
+        return history
+
+
+def _encode(values: array) -> str:
+    """Encode a typed array as base64."""
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode(typecode: str, data: str) -> array:
+    """Decode a base64 typed array."""
+    values = array(typecode)
+    values.frombytes(base64.b64decode(data))
+    return values
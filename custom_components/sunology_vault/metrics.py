@@ -0,0 +1,172 @@
+"""Request and poll cycle metrics."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds of the latency histogram buckets, in ms; the last bucket
+# counts everything slower.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+    count: int = 0
+    total_ms: float = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        """Count a latency."""
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add the counts of another histogram."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total_ms += other.total_ms
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket holding the q quantile.
+
+        Latencies beyond the last bound are reported as that bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return float(LATENCY_BUCKETS_MS[-1])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot."""
+        labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS]
+        labels.append(f">{LATENCY_BUCKETS_MS[-1]}")
+        return {
+            "buckets_ms": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+        }
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Counters of the requests to one endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    unchanged: int = 0
+    bytes_received: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "unchanged": self.unchanged,
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class ClientMetrics:
+    """Counters of the requests sent by a client, per endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def _endpoint(self, key: str) -> EndpointMetrics:
+        """Return the counters of an endpoint."""
+        if (metrics := self.endpoints.get(key)) is None:
+            metrics = self.endpoints[key] = EndpointMetrics()
+        return metrics
+
+    def record_request(
+        self, key: str, latency_ms: float, size: int | None, error: bool
+    ) -> None:
+        """Count a request attempt."""
+        metrics = self._endpoint(key)
+        metrics.requests += 1
+        if error:
+            metrics.errors += 1
+        if size:
+            metrics.bytes_received += size
+        metrics.latency.observe(latency_ms)
+
+    def record_retry(self, key: str) -> None:
+        """Count a retry."""
+        self._endpoint(key).retries += 1
+
+    def record_unchanged(self, key: str) -> None:
+        """Count a response identical to the previous one."""
+        self._endpoint(key).unchanged += 1
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests to every endpoint."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests to every endpoint."""
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+    @property
+    def retries(self) -> int:
+        """Return the number of retries to every endpoint."""
+        return sum(metrics.retries for metrics in self.endpoints.values())
+
+    @property
+    def unchanged(self) -> int:
+        """Return the number of unchanged responses from every endpoint."""
+        return sum(metrics.unchanged for metrics in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the number of bytes received from every endpoint."""
+        return sum(metrics.bytes_received for metrics in self.endpoints.values())
+
+    def latency(self) -> LatencyHistogram:
+        """Return the latency histogram of every endpoint."""
+        histogram = LatencyHistogram()
+        for metrics in self.endpoints.values():
+            histogram.merge(metrics.latency)
+        return histogram
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot."""
+        return {key: metrics.as_dict() for key, metrics in self.endpoints.items()}
+
+
+@dataclass(slots=True)
+class PollMetrics:
+    """Poll cycle counters, and durations of the last stages in ms.
+
+    parse_ms covers applying the overview to every battery, including
+    history, power and energy updates. details_ms is the last details
+    fan-out, which does not run on every poll. skipped_polls counts polls
+    whose overview was unchanged, and was not applied again.
+    """
+
+    polls: int = 0
+    failed_polls: int = 0
+    skipped_polls: int = 0
+    duration_ms: float | None = None
+    details_ms: float | None = None
+    overview_ms: float | None = None
+    parse_ms: float | None = None
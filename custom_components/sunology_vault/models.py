@@ -0,0 +1,200 @@
+"""Data model for Sunology VAULT and parsers from API payloads."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import Any
+
+DEFAULT_THRESHOLD = 210
+
+METER_KIND_STREAM_METER = "stream_meter"
+METER_KIND_ERL = "erl"
+
+_EMPTY: dict[str, Any] = {}
+
+
+@dataclass(slots=True)
+class BatteryData:
+    """Data for a single battery."""
+
+    serial: str
+    name: str
+    station_id: str = ""
+    battery_level: int = 0
+    battery_state: str = ""
+    device_state: str = ""
+    preserve_energy: bool = False
+    threshold: int = DEFAULT_THRESHOLD
+    stale: bool = False
+    power: float | None = None
+    energy_charged: float = 0.0
+    energy_discharged: float = 0.0
+    production_power: float | None = None
+    preserve_energy_pending: bool = False
+    threshold_pending: bool = False
+
+
+BATTERY_FIELDS = tuple(f.name for f in fields(BatteryData))
+
+# Return an immutable snapshot of every field of a battery, for diffing
+battery_snapshot = attrgetter(*BATTERY_FIELDS)
+
+# Fields of a battery persisted across restarts. Power is estimated again,
+# energy totals are persisted on their own, and pending writes are dropped.
+PERSISTED_FIELDS = (
+    "name",
+    "station_id",
+    "battery_level",
+    "battery_state",
+    "device_state",
+    "preserve_energy",
+    "threshold",
+    "production_power",
+)
+_persisted_values = attrgetter(*PERSISTED_FIELDS)
+
+
+@dataclass(slots=True)
+class MeterData:
+    """Live data of a STREAM meter or an ERL, requested by id."""
+
+    id: str
+    kind: str
+    power: float | None = None
+
+
+@dataclass(slots=True)
+class SunologyData:
+    """Data from Sunology API."""
+
+    batteries: dict[str, BatteryData] = field(default_factory=dict)
+    stream_meters: dict[str, MeterData] = field(default_factory=dict)
+    erls: dict[str, MeterData] = field(default_factory=dict)
+
+
+def get_or_default(data: dict[str, Any], key: str, default: Any) -> Any:
+    """Get value from dict, returning default if None or missing."""
+    value = data.get(key)
+    return value if value is not None else default
+
+
+def as_int(value: Any, default: int) -> int:
+    """Convert an API number, sometimes sent as a string, to an int."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def as_float(value: Any) -> float | None:
+    """Convert an API number to a float, None if missing or invalid."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_level(value: Any) -> int:
+    """Convert a battery level, 0 if missing."""
+    return as_int(value, 0)
+
+
+def _as_str(value: Any) -> str:
+    """Convert a state, empty if missing."""
+    return value or ""
+
+
+def _as_threshold(value: Any) -> int:
+    """Convert a charge threshold, the default if missing."""
+    return as_int(value, DEFAULT_THRESHOLD)
+
+
+def battery_as_dict(battery: BatteryData) -> dict[str, Any]:
+    """Return the persisted fields of a battery."""
+    return dict(zip(PERSISTED_FIELDS, _persisted_values(battery)))
+
+
+def battery_from_dict(serial: str, data: dict[str, Any]) -> BatteryData:
+    """Restore a battery from its persisted fields, flagged stale."""
+    return BatteryData(
+        serial=serial,
+        stale=True,
+        **{name: data[name] for name in PERSISTED_FIELDS if name in data},
+    )
+
+
+def parse_stations(
+    stations: list[dict[str, Any]], batteries: dict[str, BatteryData]
+) -> list[BatteryData]:
+    """Update batteries from the station list and return the listed ones.
+
+    Batteries not seen before are created; known ones keep their state.
+    """
+    listed: list[BatteryData] = []
+    for station in stations:
+        serial = station["serialNumber"]
+        battery = batteries.get(serial)
+        if battery is None:
+            battery = batteries[serial] = BatteryData(serial=serial, name=serial)
+        battery.name = station.get("name") or serial
+        battery.station_id = station["id"]
+        listed.append(battery)
+    return listed
+
+
+def apply_details(battery: BatteryData, details: dict[str, Any]) -> None:
+    """Update the settings of a battery from its station details.
+
+    Only the fields the data model uses are read, straight into it; missing
+    ones get their default.
+    """
+    get = details.get
+    battery.preserve_energy = bool(get("batteryPreserveEnergy"))
+    battery.threshold = _as_threshold(get("batteryThreshold"))
+
+
+def overview_panels(overview: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the live data of the panels in an overview, keyed by serial."""
+    return (overview.get("production") or _EMPTY).get("panels") or _EMPTY
+
+
+def apply_panel(battery: BatteryData, panel: dict[str, Any] | None) -> None:
+    """Update the live data of a battery from its overview panel entry.
+
+    Only the fields the data model uses are read, straight into it; missing
+    ones, or a missing entry, get their default.
+    """
+    get = (panel or _EMPTY).get
+    battery.battery_level = _as_level(get("battery"))
+    battery.battery_state = _as_str(get("batteryState"))
+    battery.device_state = _as_str(get("deviceState"))
+    battery.production_power = as_float(get("power"))
+
+
+def _overview_items(section: Any) -> dict[str, dict[str, Any]]:
+    """Return the entries of an overview section keyed by id.
+
+    Sections are either maps keyed by id, or lists of objects with an id.
+    """
+    if isinstance(section, dict):
+        return section
+    if isinstance(section, list):
+        return {
+            str(item["id"]): item
+            for item in section
+            if isinstance(item, dict) and "id" in item
+        }
+    return _EMPTY
+
+
+def apply_meters(meters: dict[str, MeterData], section: Any) -> None:
+    """Update the requested meters from their overview section.
+
+    A meter missing from the section has an unknown reading.
+    """
+    items = _overview_items(section)
+    for meter_id, meter in meters.items():
+        meter.power = as_float((items.get(meter_id) or _EMPTY).get("power"))
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+from typing import Any
+
 from homeassistant.components.number import NumberDeviceClass, NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfPower
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN, MAX_THRESHOLD, MIN_THRESHOLD
@@ -21,12 +24,14 @@ async def async_setup_entry(
     """Set up number entities from config entry."""
     coordinator: SunologyDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[NumberEntity] = []
-
-    for serial in coordinator.data.batteries:
-        entities.append(SunologyThresholdNumber(coordinator, serial))
+    @callback
+    def _async_add_batteries(serials: Iterable[str]) -> None:
+        async_add_entities(
+            SunologyThresholdNumber(coordinator, serial) for serial in serials
+        )
 
-    async_add_entities(entities)
+    _async_add_batteries(coordinator.data.batteries)
+    entry.async_on_unload(coordinator.async_add_battery_listener(_async_add_batteries))
 
 
 class SunologyThresholdNumber(SunologyVaultEntity, NumberEntity):
@@ -40,6 +45,7 @@ class SunologyThresholdNumber(SunologyVaultEntity, NumberEntity):
     _attr_native_unit_of_measurement = UnitOfPower.WATT
     _attr_mode = NumberMode.SLIDER
     _available_when_unplugged = True
+    _watched_fields = frozenset({"threshold", "threshold_pending"})
 
     def __init__(
         self, coordinator: SunologyDataUpdateCoordinator, serial: str
@@ -56,6 +62,14 @@ class SunologyThresholdNumber(SunologyVaultEntity, NumberEntity):
             return battery.threshold
         return None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return whether the values are stale or the last change pending."""
+        battery = self._battery_data
+        if battery:
+            return {"stale": battery.stale, "pending": battery.threshold_pending}
+        return None
+
     async def async_set_native_value(self, value: float) -> None:
         """Set the threshold value."""
         await self.coordinator.async_set_threshold(self._serial, int(value))
@@ -0,0 +1,127 @@
+"""On-demand profiling of the integration's hot paths."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+import cProfile
+import io
+import os
+import pstats
+import re
+import tracemalloc
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATS_LINES = 40
+TOP_ALLOCATIONS = 20
+
+
+class ProfileCapture:
+    """Profile the polls, listener updates and writes of the coordinators.
+
+    cProfile is only enabled while one of those sections runs, until the
+    given number of polls completed. Other event loop tasks may run while a
+    section waits for the network, so summaries are restricted to the
+    integration's code; cumulative times still include the JSON decoding
+    and entity state writes it calls. Allocations of the whole process are
+    traced meanwhile, to report the peak.
+
+    Nothing is profiled or traced outside of a capture. finish() takes a
+    snapshot of the traced allocations and writes files: run it in an
+    executor.
+    """
+
+    def __init__(self, polls: int) -> None:
+        """Initialize the capture."""
+        self.polls = polls
+        self.completed = 0
+        self.peak_memory: int | None = None
+        self._profile = cProfile.Profile()
+        self._depth = 0
+        self._done = asyncio.Event()
+        self._started_tracing = False
+        self._baseline = 0
+        self._allocations: list[tracemalloc.Statistic] = []
+
+    def start(self) -> None:
+        """Start tracing allocations.
+
+        Raise RuntimeError if another profiler is active.
+        """
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            raise RuntimeError(str(err)) from err
+        self._profile.disable()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+
+    @contextmanager
+    def section(self) -> Iterator[None]:
+        """Profile the block, which may overlap sections of other tasks."""
+        if self._depth == 0:
+            self._profile.enable()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._profile.disable()
+
+    def poll_done(self) -> None:
+        """Count a completed poll."""
+        self.completed += 1
+        if self.completed >= self.polls:
+            self._done.set()
+
+    async def async_wait(self) -> None:
+        """Wait until the requested number of polls completed."""
+        await self._done.wait()
+
+    def abort(self) -> None:
+        """Stop tracing allocations, without collecting them."""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def finish(self, directory: str, name: str) -> tuple[str, str]:
+        """Stop tracing and write the results, return the paths of the files."""
+        self._stop()
+        return self._write(directory, name)
+
+    def _stop(self) -> None:
+        """Stop tracing allocations, keeping the peak and the top sites."""
+        if not tracemalloc.is_tracing():
+            return
+        self.peak_memory = tracemalloc.get_traced_memory()[1] - self._baseline
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(True, os.path.join(PACKAGE_DIR, "*")),)
+        )
+        self._allocations = snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def _write(self, directory: str, name: str) -> tuple[str, str]:
+        """Write the .prof file and the text summary, return their paths."""
+        profile_path = os.path.join(directory, f"{name}.prof")
+        summary_path = os.path.join(directory, f"{name}.txt")
+        self._profile.dump_stats(profile_path)
+
+        stream = io.StringIO()
+        stream.write(f"Polls profiled: {self.completed}\n")
+        if self.peak_memory is not None:
+            stream.write(f"Peak allocated memory: {self.peak_memory / 1024:.1f} KiB\n")
+        stats = pstats.Stats(self._profile, stream=stream)
+        restriction = re.escape(PACKAGE_DIR)
+        for sort_key in (pstats.SortKey.CUMULATIVE, pstats.SortKey.TIME):
+            stats.sort_stats(sort_key).print_stats(restriction, STATS_LINES)
+        stream.write("Top allocations by the integration still alive:\n")
+        for statistic in self._allocations:
+            stream.write(f"{statistic}\n")
+        with open(summary_path, "w", encoding="utf-8") as file:
+            file.write(stream.getvalue())
+        return profile_path, summary_path
@@ -0,0 +1,128 @@
+"""Retry and circuit breaker policies for the Sunology API client."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+import random
+import re
+import time
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 60
+
+_ID_SEGMENT = re.compile(r"(/api/solar-panels)/[^/]+")
+_ID_PLACEHOLDER = r"\1/{id}"
+
+
+@dataclass(frozen=True, slots=True)
+class BackoffPolicy:
+    """Exponential backoff with jitter."""
+
+    attempts: int = 3
+    base: float = 1.0
+    maximum: float = 30.0
+    jitter: float = 0.5
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Return the delay before the next attempt, None to stop retrying.
+
+        A Retry-After hint from the server takes precedence, unless it is
+        longer than the maximum delay.
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.maximum else None
+        delay = min(self.base * 2 ** (attempt - 1), self.maximum)
+        return delay * random.uniform(1 - self.jitter, 1)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+def endpoint_key(method: str, endpoint: str) -> str:
+    """Return the key grouping requests to the same endpoint, ids excluded."""
+    return f"{method} {_ID_SEGMENT.sub(_ID_PLACEHOLDER, endpoint)}"
+
+
+def circuit_key(method: str, endpoint: str) -> str:
+    """Return the key of the circuit breaker guarding requests to an endpoint.
+
+    Ids are kept, so that a failing station does not suspend the requests to
+    the other stations.
+    """
+    return f"{method} {endpoint}"
+
+
+class CircuitBreaker:
+    """Suspend requests to an endpoint after repeated failures.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests fail immediately. Once reset_timeout has elapsed, a single probe
+    request is let through (half-open): its success closes the circuit, its
+    failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if requests are currently suspended."""
+        return self._opened_at is not None
+
+    @property
+    def probing(self) -> bool:
+        """Return True while the half-open probe request is in flight."""
+        return self._probing
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent."""
+        if self._opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self._opened_at < self._reset_timeout:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def abort_probe(self) -> None:
+        """Let another probe through if the current one was cancelled."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit past the threshold."""
+        self._failures += 1
+        if self._probing or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probing = False
@@ -0,0 +1,100 @@
+"""Process-wide request scheduling for Sunology API clients."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+
+PRIORITY_WRITE = 0
+PRIORITY_POLL = 1
+
+
+class RequestScheduler:
+    """Token bucket shared by every client talking to the Sunology backend.
+
+    When the bucket is empty, waiting requests are released by priority
+    (user-initiated writes before background polls), then in arrival order.
+    The scheduler also assigns evenly spread polling phases to the
+    coordinators registered with it, so that accounts do not poll in bursts.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST) -> None:
+        """Initialize the scheduler with a rate in requests per second."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self._members: list[str] = []
+        self._epoch = time.monotonic()
+        self.generation = 0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> None:
+        """Wait until a request may be sent."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._schedule_wakeup()
+        await future
+
+    def _schedule_wakeup(self) -> None:
+        """Release waiters once enough tokens are available."""
+        if self._wakeup is not None:
+            return
+        delay = max(0.0, (1 - self._tokens) / self._rate)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Release as many waiters as there are tokens."""
+        self._wakeup = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Cancelled while waiting
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        if self._waiters:
+            self._schedule_wakeup()
+
+    def register(self, key: str) -> None:
+        """Register a coordinator for polling phase assignment."""
+        if key not in self._members:
+            self._members.append(key)
+            self.generation += 1
+
+    def unregister(self, key: str) -> None:
+        """Unregister a coordinator."""
+        if key in self._members:
+            self._members.remove(key)
+            self.generation += 1
+
+    def phase_delay(self, key: str, interval: float) -> float:
+        """Return how long to wait so that the next poll lands on the key's phase.
+
+        Registered coordinators get phases evenly spread over the interval,
+        relative to a common epoch.
+        """
+        if key not in self._members or len(self._members) < 2 or interval <= 0:
+            return 0.0
+        target = interval * self._members.index(key) / len(self._members)
+        current = (time.monotonic() - self._epoch) % interval
+        return (target - current) % interval
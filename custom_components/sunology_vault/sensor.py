@@ -2,19 +2,31 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfEnergy
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfPower,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import BATTERY_CAPACITY_WH, DOMAIN
 from .coordinator import SunologyDataUpdateCoordinator
-from .entity import SunologyVaultEntity
+from .entity import SunologyAccountEntity, SunologyMeterEntity, SunologyVaultEntity
+from .models import MeterData
 
 
 async def async_setup_entry(
@@ -25,14 +37,29 @@ async def async_setup_entry(
     """Set up sensors from config entry."""
     coordinator: SunologyDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[SensorEntity] = []
+    @callback
+    def _async_add_batteries(serials: Iterable[str]) -> None:
+        async_add_entities(
+            sensor_class(coordinator, serial)
+            for serial in serials
+            for sensor_class in BATTERY_SENSORS
+        )
+
+    _async_add_batteries(coordinator.data.batteries)
+    entry.async_on_unload(coordinator.async_add_battery_listener(_async_add_batteries))
 
-    for serial in coordinator.data.batteries:
-        entities.append(SunologyBatteryLevelSensor(coordinator, serial))
-        entities.append(SunologyBatteryStateSensor(coordinator, serial))
-        entities.append(SunologyBatteryEnergySensor(coordinator, serial))
+    async_add_entities(
+        SunologyMetricSensor(coordinator, description)
+        for description in METRIC_SENSORS
+    )
 
-    async_add_entities(entities)
+    async_add_entities(
+        SunologyMeterPowerSensor(coordinator, meter)
+        for meter in (
+            *coordinator.data.stream_meters.values(),
+            *coordinator.data.erls.values(),
+        )
+    )
 
 
 class SunologyBatteryLevelSensor(SunologyVaultEntity, SensorEntity):
@@ -42,6 +69,7 @@ class SunologyBatteryLevelSensor(SunologyVaultEntity, SensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_translation_key = "battery_level"
+    _watched_fields = frozenset({"battery_level"})
 
     def __init__(
         self, coordinator: SunologyDataUpdateCoordinator, serial: str
@@ -66,6 +94,7 @@ class SunologyBatteryStateSensor(SunologyVaultEntity, SensorEntity):
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_options = ["off", "charging", "discharging", "unplugged"]
     _attr_translation_key = "battery_state"
+    _watched_fields = frozenset({"battery_state"})
 
     def __init__(
         self, coordinator: SunologyDataUpdateCoordinator, serial: str
@@ -102,6 +131,7 @@ class SunologyBatteryEnergySensor(SunologyVaultEntity, SensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
     _attr_translation_key = "battery_energy"
+    _watched_fields = frozenset({"battery_level"})
 
     def __init__(
         self, coordinator: SunologyDataUpdateCoordinator, serial: str
@@ -117,3 +147,354 @@ class SunologyBatteryEnergySensor(SunologyVaultEntity, SensorEntity):
         if battery:
             return int(battery.battery_level * BATTERY_CAPACITY_WH / 100)
         return None
+
+
+class SunologyChargePowerSensor(SunologyVaultEntity, SensorEntity):
+    """Charge power sensor, estimated from the battery level trend."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_translation_key = "charge_power"
+    _watched_fields = frozenset({"power"})
+
+    def __init__(
+        self, coordinator: SunologyDataUpdateCoordinator, serial: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, serial)
+        self._attr_unique_id = f"{serial}_charge_power"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the charge power in W."""
+        battery = self._battery_data
+        if battery and battery.power is not None:
+            return max(battery.power, 0.0)
+        return None
+
+
+class SunologyDischargePowerSensor(SunologyVaultEntity, SensorEntity):
+    """Discharge power sensor, estimated from the battery level trend."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_translation_key = "discharge_power"
+    _watched_fields = frozenset({"power"})
+
+    def __init__(
+        self, coordinator: SunologyDataUpdateCoordinator, serial: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, serial)
+        self._attr_unique_id = f"{serial}_discharge_power"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the discharge power in W."""
+        battery = self._battery_data
+        if battery and battery.power is not None:
+            return max(-battery.power, 0.0)
+        return None
+
+
+class SunologyTimeToFullSensor(SunologyVaultEntity, SensorEntity):
+    """Estimated time until the battery is full."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_translation_key = "time_to_full"
+    _watched_fields = frozenset({"power", "battery_level"})
+
+    def __init__(
+        self, coordinator: SunologyDataUpdateCoordinator, serial: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, serial)
+        self._attr_unique_id = f"{serial}_time_to_full"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the minutes left until full at the current charge power."""
+        battery = self._battery_data
+        if battery and battery.power is not None and battery.power > 0:
+            missing_wh = (100 - battery.battery_level) * BATTERY_CAPACITY_WH / 100
+            return round(missing_wh / battery.power * 60)
+        return None
+
+
+class SunologyTimeToEmptySensor(SunologyVaultEntity, SensorEntity):
+    """Estimated time until the battery is empty."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_translation_key = "time_to_empty"
+    _watched_fields = frozenset({"power", "battery_level"})
+
+    def __init__(
+        self, coordinator: SunologyDataUpdateCoordinator, serial: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, serial)
+        self._attr_unique_id = f"{serial}_time_to_empty"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the minutes left until empty at the current discharge power."""
+        battery = self._battery_data
+        if battery and battery.power is not None and battery.power < 0:
+            available_wh = battery.battery_level * BATTERY_CAPACITY_WH / 100
+            return round(available_wh / -battery.power * 60)
+        return None
+
+
+class SunologyEnergyChargedSensor(SunologyVaultEntity, SensorEntity):
+    """Total energy charged into the battery."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
+    _attr_translation_key = "energy_charged"
+    _available_when_unplugged = True
+    _watched_fields = frozenset({"energy_charged"})
+
+    def __init__(
+        self, coordinator: SunologyDataUpdateCoordinator, serial: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, serial)
+        self._attr_unique_id = f"{serial}_energy_charged"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the total energy charged in Wh."""
+        battery = self._battery_data
+        if battery:
+            return battery.energy_charged
+        return None
+
+
+class SunologyEnergyDischargedSensor(SunologyVaultEntity, SensorEntity):
+    """Total energy discharged from the battery."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
+    _attr_translation_key = "energy_discharged"
+    _available_when_unplugged = True
+    _watched_fields = frozenset({"energy_discharged"})
+
+    def __init__(
+        self, coordinator: SunologyDataUpdateCoordinator, serial: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, serial)
+        self._attr_unique_id = f"{serial}_energy_discharged"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the total energy discharged in Wh."""
+        battery = self._battery_data
+        if battery:
+            return battery.energy_discharged
+        return None
+
+
+class SunologyProductionPowerSensor(SunologyVaultEntity, SensorEntity):
+    """Solar panel production power sensor."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_translation_key = "production_power"
+    _available_when_unplugged = True
+    _watched_fields = frozenset({"production_power"})
+
+    def __init__(
+        self, coordinator: SunologyDataUpdateCoordinator, serial: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, serial)
+        self._attr_unique_id = f"{serial}_production_power"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the production power in W."""
+        battery = self._battery_data
+        if battery:
+            return battery.production_power
+        return None
+
+
+BATTERY_SENSORS: tuple[type[SunologyVaultEntity], ...] = (
+    SunologyBatteryLevelSensor,
+    SunologyBatteryStateSensor,
+    SunologyBatteryEnergySensor,
+    SunologyChargePowerSensor,
+    SunologyDischargePowerSensor,
+    SunologyTimeToFullSensor,
+    SunologyTimeToEmptySensor,
+    SunologyEnergyChargedSensor,
+    SunologyEnergyDischargedSensor,
+    SunologyProductionPowerSensor,
+)
+
+
+class SunologyMeterPowerSensor(SunologyMeterEntity, SensorEntity):
+    """STREAM meter or ERL power sensor."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_translation_key = "meter_power"
+
+    def __init__(
+        self, coordinator: SunologyDataUpdateCoordinator, meter: MeterData
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, meter)
+        self._attr_unique_id = f"{meter.kind}_{meter.id}_power"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the power reading in W."""
+        meter = self._meter_data
+        if meter:
+            return meter.power
+        return None
+
+
+@dataclass(frozen=True, kw_only=True)
+class SunologyMetricSensorEntityDescription(SensorEntityDescription):
+    """Description of a request or poll cycle metric sensor."""
+
+    value_fn: Callable[[SunologyDataUpdateCoordinator], float | None]
+
+
+METRIC_SENSORS: tuple[SunologyMetricSensorEntityDescription, ...] = (
+    SunologyMetricSensorEntityDescription(
+        key="poll_duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: coordinator.poll_metrics.duration_ms,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="overview_duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: coordinator.poll_metrics.overview_ms,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="details_duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: coordinator.poll_metrics.details_ms,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="parse_duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator: coordinator.poll_metrics.parse_ms,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="api_latency_p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: (
+            coordinator.client.metrics.latency().quantile(0.95)
+        ),
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="api_requests",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.requests,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="api_errors",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.errors,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="api_retries",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.retries,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="bytes_received",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda coordinator: coordinator.client.metrics.bytes_received,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="failed_polls",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.poll_metrics.failed_polls,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="skipped_polls",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.poll_metrics.skipped_polls,
+    ),
+    SunologyMetricSensorEntityDescription(
+        key="api_unchanged",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.unchanged,
+    ),
+)
+
+
+class SunologyMetricSensor(SunologyAccountEntity, SensorEntity):
+    """Request or poll cycle metric of the account."""
+
+    entity_description: SunologyMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SunologyDataUpdateCoordinator,
+        description: SunologyMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_translation_key = description.key
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the metric value."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,226 @@
+"""Services for Sunology VAULT."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, MAX_THRESHOLD, MIN_THRESHOLD
+from .coordinator import SunologyDataUpdateCoordinator
+from .history import HISTORY_SIZE
+from .profiling import ProfileCapture
+from .writes import PendingWrite
+
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_APPLY_FLEET_SETTINGS = "apply_fleet_settings"
+SERVICE_REFRESH = "refresh"
+SERVICE_PROFILE = "profile"
+
+ATTR_SERIAL = "serial"
+ATTR_HOURS = "hours"
+ATTR_BUCKETS = "buckets"
+ATTR_BATTERIES = "batteries"
+ATTR_THRESHOLD = "threshold"
+ATTR_PRESERVE_ENERGY = "preserve_energy"
+ATTR_POLLS = "polls"
+ATTR_TIMEOUT = "timeout"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SERIAL): cv.string,
+        vol.Optional(ATTR_HOURS, default=24): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=HISTORY_SIZE / 60)
+        ),
+        vol.Optional(ATTR_BUCKETS, default=48): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+    }
+)
+
+APPLY_FLEET_SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_BATTERIES): vol.All(
+            vol.Length(min=1),
+            {
+                cv.string: vol.All(
+                    {
+                        vol.Optional(ATTR_THRESHOLD): vol.All(
+                            vol.Coerce(int),
+                            vol.Range(min=MIN_THRESHOLD, max=MAX_THRESHOLD),
+                        ),
+                        vol.Optional(ATTR_PRESERVE_ENERGY): cv.boolean,
+                    },
+                    cv.has_at_least_one_key(ATTR_THRESHOLD, ATTR_PRESERVE_ENERGY),
+                )
+            },
+        ),
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_SERIAL): vol.All(cv.ensure_list, [cv.string])}
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_POLLS, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=900): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=3600)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, serial: str) -> SunologyDataUpdateCoordinator:
+    """Return the coordinator managing a battery."""
+    coordinator: SunologyDataUpdateCoordinator
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        if serial in coordinator.data.batteries:
+            return coordinator
+    raise ServiceValidationError(f"Battery {serial} not found")
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    @callback
+    def _async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return downsampled battery history from memory."""
+        serial = call.data[ATTR_SERIAL]
+        coordinator = _get_coordinator(hass, serial)
+        end = time.time()
+        start = end - call.data[ATTR_HOURS] * 3600
+        history = coordinator.history.get(serial)
+        buckets = (
+            history.downsample(start, end, call.data[ATTR_BUCKETS]) if history else []
+        )
+        for bucket in buckets:
+            bucket["start"] = dt_util.utc_from_timestamp(bucket["start"]).isoformat()
+            bucket["end"] = dt_util.utc_from_timestamp(bucket["end"]).isoformat()
+        return {"serial": serial, "buckets": buckets}
+
+    async def _async_apply_fleet_settings(call: ServiceCall) -> ServiceResponse:
+        """Apply settings to several batteries, possibly across accounts."""
+        by_coordinator: dict[
+            SunologyDataUpdateCoordinator, dict[str, PendingWrite]
+        ] = {}
+        for serial, settings in call.data[ATTR_BATTERIES].items():
+            coordinator = _get_coordinator(hass, serial)
+            by_coordinator.setdefault(coordinator, {})[serial] = PendingWrite(
+                preserve_energy=settings.get(ATTR_PRESERVE_ENERGY),
+                threshold=settings.get(ATTR_THRESHOLD),
+            )
+
+        results: dict[str, dict[str, Any]] = {}
+        for outcome in await asyncio.gather(
+            *(
+                coordinator.async_apply_fleet_settings(settings)
+                for coordinator, settings in by_coordinator.items()
+            )
+        ):
+            results.update(outcome)
+        return {"results": results}
+
+    async def _async_refresh(call: ServiceCall) -> None:
+        """Refresh the given batteries now, or every account without serials."""
+        if (serials := call.data.get(ATTR_SERIAL)) is None:
+            await asyncio.gather(
+                *(
+                    coordinator.async_refresh_all()
+                    for coordinator in hass.data.get(DOMAIN, {}).values()
+                )
+            )
+            return
+        targets = [(_get_coordinator(hass, serial), serial) for serial in serials]
+        await asyncio.gather(
+            *(
+                coordinator.async_refresh_station(serial)
+                for coordinator, serial in targets
+            )
+        )
+
+    async def _async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the next polls and writes of every account."""
+        coordinators: list[SunologyDataUpdateCoordinator] = list(
+            hass.data.get(DOMAIN, {}).values()
+        )
+        if not coordinators:
+            raise ServiceValidationError("No Sunology account is set up")
+        if any(coordinator.profile is not None for coordinator in coordinators):
+            raise ServiceValidationError("A profile is already being captured")
+
+        capture = ProfileCapture(call.data[ATTR_POLLS])
+        try:
+            capture.start()
+        except RuntimeError as err:
+            raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+        for coordinator in coordinators:
+            coordinator.profile = capture
+        try:
+            async with asyncio.timeout(call.data[ATTR_TIMEOUT]):
+                await capture.async_wait()
+        except TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            capture.abort()
+            raise
+        finally:
+            for coordinator in coordinators:
+                coordinator.profile = None
+
+        name = f"{DOMAIN}_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}"
+        profile_path, summary_path = await hass.async_add_executor_job(
+            capture.finish, hass.config.config_dir, name
+        )
+        return {
+            "polls": capture.completed,
+            "profile": profile_path,
+            "summary": summary_path,
+            "peak_memory_kib": (
+                round(capture.peak_memory / 1024, 1)
+                if capture.peak_memory is not None
+                else None
+            ),
+        }
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, _async_refresh, schema=REFRESH_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_FLEET_SETTINGS,
+        _async_apply_fleet_settings,
+        schema=APPLY_FLEET_SETTINGS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
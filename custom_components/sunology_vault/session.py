@@ -0,0 +1,28 @@
+"""Shared HTTP session for Sunology VAULT."""
+
+from __future__ import annotations
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN, SESSION_POOL_SIZE
+from .transport import create_session
+
+DATA_SESSION = f"{DOMAIN}_session"
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the session shared by all config entries and the config flow."""
+    session: aiohttp.ClientSession | None = hass.data.get(DATA_SESSION)
+    if session is None or session.closed:
+        session = create_session(pool_size=SESSION_POOL_SIZE)
+        hass.data[DATA_SESSION] = session
+
+        async def _async_close_session(_event: Event) -> None:
+            await session.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    return session
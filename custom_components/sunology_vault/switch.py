@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
@@ -22,12 +23,14 @@ async def async_setup_entry(
     """Set up switches from config entry."""
     coordinator: SunologyDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[SwitchEntity] = []
+    @callback
+    def _async_add_batteries(serials: Iterable[str]) -> None:
+        async_add_entities(
+            SunologyPreserveEnergySwitch(coordinator, serial) for serial in serials
+        )
 
-    for serial in coordinator.data.batteries:
-        entities.append(SunologyPreserveEnergySwitch(coordinator, serial))
-
-    async_add_entities(entities)
+    _async_add_batteries(coordinator.data.batteries)
+    entry.async_on_unload(coordinator.async_add_battery_listener(_async_add_batteries))
 
 
 class SunologyPreserveEnergySwitch(SunologyVaultEntity, SwitchEntity):
@@ -35,6 +38,7 @@ class SunologyPreserveEnergySwitch(SunologyVaultEntity, SwitchEntity):
 
     _attr_translation_key = "preserve_energy"
     _available_when_unplugged = True
+    _watched_fields = frozenset({"preserve_energy", "preserve_energy_pending"})
 
     def __init__(
         self, coordinator: SunologyDataUpdateCoordinator, serial: str
@@ -51,6 +55,14 @@ class SunologyPreserveEnergySwitch(SunologyVaultEntity, SwitchEntity):
             return battery.preserve_energy
         return None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return whether the values are stale or the last change pending."""
+        battery = self._battery_data
+        if battery:
+            return {"stale": battery.stale, "pending": battery.preserve_energy_pending}
+        return None
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on preserve energy mode."""
         await self.coordinator.async_set_preserve_energy(self._serial, True)
@@ -0,0 +1,44 @@
+"""Ring buffer of recent Sunology API requests."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any
+
+TRACE_BUFFER_SIZE = 50
+
+
+@dataclass(slots=True)
+class TraceRecord:
+    """A single request/response exchange."""
+
+    timestamp: float
+    method: str
+    endpoint: str
+    status: int | None
+    latency_ms: float
+    size: int | None
+    request_body: Any = None
+    response_body: Any = None
+    error: str | None = None
+
+
+class RequestTracer:
+    """Keep the last requests for diagnostics.
+
+    Records only hold references to the decoded bodies, nothing is copied or
+    serialized until the buffer is dumped.
+    """
+
+    def __init__(self, maxlen: int = TRACE_BUFFER_SIZE) -> None:
+        """Initialize the tracer."""
+        self._records: deque[TraceRecord] = deque(maxlen=maxlen)
+
+    def record(self, record: TraceRecord) -> None:
+        """Append a record, dropping the oldest one when full."""
+        self._records.append(record)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the records, oldest first."""
+        return [asdict(record) for record in self._records]
@@ -0,0 +1,74 @@
+"""HTTP transport for the Sunology API."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+from typing import Any
+
+import aiohttp
+
+from .const import API_HEADERS
+
+DEFAULT_POOL_SIZE = 10
+KEEPALIVE_TIMEOUT = 120
+DNS_CACHE_TTL = 600
+REQUEST_TIMEOUT = 30
+
+
+def _brotli_available() -> bool:
+    """Return True if aiohttp can decode brotli responses."""
+    try:
+        import brotlicffi  # noqa: F401
+    except ImportError:
+        try:
+            import brotli  # noqa: F401
+        except ImportError:
+            return False
+    return True
+
+
+# Only advertise brotli when aiohttp is able to decompress it
+REQUEST_HEADERS = (
+    {**API_HEADERS, "Accept-Encoding": "gzip, deflate, br"}
+    if _brotli_available()
+    else dict(API_HEADERS)
+)
+
+
+def _json_decoder() -> Callable[[bytes], Any]:
+    """Return the fastest available JSON decoder."""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+# orjson ships with Home Assistant, the standard library is the fallback
+JSON_DECODER = _json_decoder()
+
+
+def create_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+    dns_cache_ttl: int = DNS_CACHE_TTL,
+) -> aiohttp.ClientSession:
+    """Create a pooled session tuned for the Sunology backend.
+
+    Connections are kept alive longer than the default so that polls reuse
+    warm TLS connections, and the session token is sent explicitly by the
+    client, so cookies are not stored.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=pool_size,
+        limit_per_host=pool_size,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_cache_ttl,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+    )
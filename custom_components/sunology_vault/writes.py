@@ -0,0 +1,214 @@
+"""Coalesced settings writes for Sunology VAULT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .models import BatteryData
+
+_LOGGER = logging.getLogger(__name__)
+
+WRITE_DEBOUNCE_DELAY = 1.0
+# Written settings are checked against the station details every minute,
+# for twice the time the cloud may take to apply a change to the panels
+WRITE_CHECK_INTERVAL = 60
+PENDING_WRITE_TIMEOUT = 10 * WRITE_CHECK_INTERVAL
+
+# Battery settings written by the integration, and their pending flag
+PENDING_FLAGS = {
+    "preserve_energy": "preserve_energy_pending",
+    "threshold": "threshold_pending",
+}
+
+
+@dataclass
+class PendingWrite:
+    """Settings waiting to be written to a station."""
+
+    preserve_energy: bool | None = None
+    threshold: int | None = None
+    futures: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+class StationWriteQueue:
+    """Debounce and merge settings writes for a single station.
+
+    Every change resets a short timer. When it fires, all pending changes are
+    merged into one write and every caller is resolved with its outcome.
+    Writes for the same station never overlap.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        flush: Callable[[PendingWrite], Awaitable[None]],
+        delay: float = WRITE_DEBOUNCE_DELAY,
+    ) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._flush = flush
+        self._delay = delay
+        self._pending: PendingWrite | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> PendingWrite | None:
+        """Return the changes not written yet."""
+        return self._pending
+
+    @callback
+    def async_enqueue(
+        self,
+        preserve_energy: bool | None = None,
+        threshold: int | None = None,
+    ) -> asyncio.Future[None]:
+        """Queue a change, returning a future resolved once it is written."""
+        if self._pending is None:
+            self._pending = PendingWrite()
+        if preserve_energy is not None:
+            self._pending.preserve_energy = preserve_energy
+        if threshold is not None:
+            self._pending.threshold = threshold
+
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        self._pending.futures.append(future)
+
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+        self._unsub_timer = async_call_later(self._hass, self._delay, self._async_fire)
+        return future
+
+    @callback
+    def _async_fire(self, _now: datetime) -> None:
+        """Hand the pending changes over to a flush task."""
+        self._unsub_timer = None
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self._hass.async_create_task(self._async_flush(pending))
+
+    async def _async_flush(self, pending: PendingWrite) -> None:
+        """Write merged changes and resolve their futures."""
+        async with self._lock:
+            try:
+                await self._flush(pending)
+            except Exception as err:  # noqa: BLE001
+                for future in pending.futures:
+                    if not future.done():
+                        future.set_exception(err)
+            else:
+                for future in pending.futures:
+                    if not future.done():
+                        future.set_result(None)
+
+    async def async_write_now(self, write: Callable[[], Awaitable[None]]) -> None:
+        """Run a write right away, after any write in progress."""
+        async with self._lock:
+            await write()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop pending changes, cancelling their futures."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._pending is not None:
+            for future in self._pending.futures:
+                future.cancel()
+            self._pending = None
+
+
+@dataclass(slots=True)
+class WriteIntent:
+    """A setting written to a station, not seen in its details yet."""
+
+    value: Any
+    written_at: float
+
+
+class PendingWriteLedger:
+    """Track written settings until the station details confirm them.
+
+    Until then, the battery data holds the written values (optimistic state)
+    and their pending flag is set, so details still carrying the previous
+    values do not flip entities back. Intents are checked against the
+    details of the station, fetched again every check interval after the
+    write: an intent that details fetched more than timeout seconds after
+    the write still contradict has expired, and the value reported by the
+    cloud wins.
+    """
+
+    def __init__(self, timeout: float = PENDING_WRITE_TIMEOUT) -> None:
+        """Initialize an empty ledger."""
+        self._timeout = timeout
+        self._intents: dict[str, dict[str, WriteIntent]] = {}
+
+    def __bool__(self) -> bool:
+        """Return True if a write is waiting for confirmation."""
+        return bool(self._intents)
+
+    def has_pending(self, serial: str) -> bool:
+        """Return True if a setting of a station is waiting for confirmation."""
+        return serial in self._intents
+
+    def is_pending(self, serial: str, setting: str) -> bool:
+        """Return True if one setting of a station is waiting for confirmation."""
+        return setting in self._intents.get(serial, ())
+
+    def record(
+        self, battery: BatteryData, setting: str, value: Any, now: float
+    ) -> None:
+        """Record a written setting and apply it optimistically."""
+        self._intents.setdefault(battery.serial, {})[setting] = WriteIntent(
+            value, now
+        )
+        setattr(battery, setting, value)
+        setattr(battery, PENDING_FLAGS[setting], True)
+
+    def reconcile(self, battery: BatteryData, now: float) -> None:
+        """Confirm, keep or expire intents once details were applied to battery."""
+        if (intents := self._intents.get(battery.serial)) is None:
+            return
+        for setting, intent in list(intents.items()):
+            if getattr(battery, setting) == intent.value:
+                _LOGGER.debug(
+                    "%s of %s confirmed: %s", setting, battery.serial, intent.value
+                )
+            elif now - intent.written_at < self._timeout:
+                setattr(battery, setting, intent.value)
+                continue
+            else:
+                _LOGGER.warning(
+                    "%s of %s was set to %s but is still reported as %s, "
+                    "keeping the reported value",
+                    setting,
+                    battery.serial,
+                    intent.value,
+                    getattr(battery, setting),
+                )
+            del intents[setting]
+            setattr(battery, PENDING_FLAGS[setting], False)
+        if not intents:
+            del self._intents[battery.serial]
+
+    def forget(self, serial: str) -> None:
+        """Drop the intents of a station."""
+        self._intents.pop(serial, None)
+
+    def as_dict(self, now: float) -> dict[str, dict[str, Any]]:
+        """Return the pending settings and their age in seconds."""
+        return {
+            serial: {
+                setting: {"value": intent.value, "age": round(now - intent.written_at)}
+                for setting, intent in intents.items()
+            }
+            for serial, intents in self._intents.items()
+        }
@@ -0,0 +1 @@
+"""Tests for the Sunology VAULT integration."""
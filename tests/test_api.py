@@ -0,0 +1,60 @@
+"""Tests for the Sunology API client."""
+
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from custom_components.sunology_vault.api import (
+    ApiError,
+    CircuitOpenError,
+    SunologyApiClient,
+)
+from custom_components.sunology_vault.resilience import (
+    DEFAULT_FAILURE_THRESHOLD,
+    BackoffPolicy,
+)
+
+FAILING_STATION = "1"
+HEALTHY_STATION = "2"
+
+
+async def _station_details(request: web.Request) -> web.Response:
+    """Answer with a server error for the failing station only."""
+    station_id = request.match_info["station_id"]
+    if station_id == FAILING_STATION:
+        return web.Response(status=500)
+    return web.json_response({"id": station_id, "batteryThreshold": "210"})
+
+
+def test_failing_station_does_not_suspend_other_stations() -> None:
+    """Repeated failures of a station only open the circuit of that station."""
+
+    async def _run() -> None:
+        app = web.Application()
+        app.router.add_get("/api/solar-panels/{station_id}", _station_details)
+        async with TestServer(app) as server:
+            client = SunologyApiClient(
+                "user@example.com",
+                "password",
+                session_token="token",
+                backoff=BackoffPolicy(attempts=1),
+                base_url=str(server.make_url("")).rstrip("/"),
+            )
+            try:
+                for _ in range(DEFAULT_FAILURE_THRESHOLD):
+                    with pytest.raises(ApiError):
+                        await client.async_get_station_details(FAILING_STATION)
+                with pytest.raises(CircuitOpenError):
+                    await client.async_get_station_details(FAILING_STATION)
+
+                details = await client.async_get_station_details(HEALTHY_STATION)
+                assert details == {"id": HEALTHY_STATION, "batteryThreshold": "210"}
+                assert client.open_circuits == [
+                    f"GET /api/solar-panels/{FAILING_STATION}"
+                ]
+            finally:
+                await client.async_close()
+
+    asyncio.run(_run())